@@ -5,17 +5,20 @@ import { useAuthStore } from "./auth"; // ✅ 인증 스토어 불러오기
 export const useBoardStore = defineStore("board", {
   state: () => ({
     posts: [],
+    nextCursor: null, // ✅ 다음 페이지 cursor (응답 헤더 X-Next-Cursor, 마지막 페이지면 null)
     postDetail: null, // ✅ 게시글 상세 데이터 저장
     comments: [], // ✅ 댓글 목록 저장
     loading: false,
   }),
 
   actions: {
-    // ✅ 모든 게시글 불러오기
-    async fetchPosts() {
+    // ✅ 게시글 한 페이지 불러오기 (cursor 페이지네이션, 다음 페이지 cursor 반환)
+    async fetchPosts({ cursor = null, limit = 20 } = {}) {
       this.loading = true;
       try {
-        const response = await boardApi.get("/board/all/");
+        const response = await boardApi.get("/board/all/", {
+          params: { limit, ...(cursor ? { cursor } : {}) },
+        });
         this.posts = response.data.map(post => ({
           id: post.id,
           title: post.title,
@@ -24,12 +27,14 @@ export const useBoardStore = defineStore("board", {
           likes: post.like_count,
           comments: post.comment_count,
         }));
+        this.nextCursor = response.headers["x-next-cursor"] || null;
         console.log("✅ 게시글 불러오기 성공:", this.posts);
       } catch (error) {
         console.error("🚨 게시글 불러오기 실패:", error);
       } finally {
         this.loading = false;
       }
+      return this.nextCursor;
     },
 
     // ✅ 특정 게시글 상세 조회
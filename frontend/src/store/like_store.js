@@ -49,5 +49,25 @@ export const useLikeStore = defineStore("like", {
         return false;
       }
     },
+
+    // ✅ 여러 게시글 / 댓글의 내 좋아요 여부 + 개수 일괄 조회 (type: "board_like" | "comment_like")
+    // → { [id]: { liked, like_count } } (로그인하지 않았거나 실패하면 {})
+    async fetchLikeStatuses(type, ids) {
+      const authStore = useAuthStore();
+      if (!authStore.isAuthenticated || ids.length === 0) {
+        return {};
+      }
+
+      try {
+        const token = authStore.accessToken;
+        const response = await likeApi.post(`/${type}/statuses`, { ids }, {
+          headers: { Authorization: `${token}` }
+        });
+        return response.data.statuses;
+      } catch (error) {
+        console.error("🚨 좋아요 상태 조회 실패:", error.response?.data || error.message);
+        return {};
+      }
+    },
   },
 });
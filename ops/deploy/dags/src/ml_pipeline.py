@@ -1,4 +1,5 @@
 import os
+import tempfile
 import pandas as pd
 import psycopg2
 import numpy as np
@@ -49,6 +50,23 @@ def save_scaler_to_minio(scaler, bucket_name, object_name):
     print(f"Scaler 저장 완료: {bucket_name}/{object_name}")
 
 
+def save_inference_pipeline(scaler, model, features, path):
+    """
+    스케일러와 XGBoost booster를 하나의 추론 파이프라인 디렉토리로 저장하는 함수.
+    - scaler.npz: RobustScaler의 center_/scale_ (NumPy 배열) + feature 순서
+    - model.json: XGBoost booster
+    서빙 쪽에서는 (X - center) / scale → booster.inplace_predict 만 수행하면 됨 (pandas 불필요)
+    """
+    os.makedirs(path, exist_ok=True)
+    np.savez(
+        os.path.join(path, "scaler.npz"),
+        center=np.asarray(scaler.center_, dtype=np.float64),
+        scale=np.asarray(scaler.scale_, dtype=np.float64),
+        features=np.asarray(features),
+    )
+    model.get_booster().save_model(os.path.join(path, "model.json"))
+
+
 class Preprocessor:
     """데이터 전처리 클래스"""
 
@@ -224,6 +242,13 @@ class EstatePredict:
             mlflow.log_metric("r2", r2)
             mlflow.xgboost.log_model(self.model, artifact_path="xgboost_model")
 
+            # ✅ scaler + booster 통합 추론 파이프라인 저장 (모델/스케일러 버전 일치 보장)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                save_inference_pipeline(
+                    self.preprocessor.scaler, self.model, self.preprocessor.X_features, tmp_dir
+                )
+                mlflow.log_artifacts(tmp_dir, artifact_path="estate_pipeline")
+
             print(f"✅ MLflow에 모델 저장 완료! (MAE: {mae:.4f}, RMSE: {rmse:.4f}, R²: {r2:.4f})")
 
 
@@ -0,0 +1,103 @@
+"""
+✅ 예측 경로별 지연시간 벤치마크 (pyfunc vs native vs dmatrix vs numpy)
+
+사용법 (ops/serve 디렉토리에서 실행):
+    python benchmarks/bench_inference.py                 # 합성 데이터로 학습한 모델 사용
+    python benchmarks/bench_inference.py --run-id <id>   # MLflow run의 모델 사용
+
+행 수 1 / 100 / 100,000 에 대해 p50 / p99 (ms)를 출력합니다.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from router.model_selection import FEATURES, LegacyPipeline, load_pipeline  # noqa: E402
+from router.inference_pipeline import InferencePipeline  # noqa: E402
+
+SIZES = (1, 100, 100_000)
+REPEATS = {1: 2000, 100: 500, 100_000: 10}
+BACKENDS = ("pyfunc", "native", "dmatrix", "numpy")
+
+
+def synthetic_features(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(1, 40, n),                      # 층
+        rng.integers(1111010100, 1174011000, n),     # 법정동코드
+        rng.integers(1970, 2024, n),                 # 건축년도
+        rng.uniform(15, 250, n),                     # 건물면적_㎡
+    ]).astype(np.float64)
+
+
+def build_synthetic_pipelines():
+    """
+    ✅ ml_pipeline.EstatePredict와 같은 설정으로 합성 데이터 모델 학습 후 backend별 파이프라인 구성
+    """
+    import mlflow
+    import xgboost as xgb
+    from sklearn.preprocessing import RobustScaler
+
+    X = synthetic_features(50_000, seed=1)
+    y = np.log1p(X[:, 3] * 800 + (2024 - X[:, 2]) * -50 + X[:, 0] * 30 + 20_000)
+
+    scaler = RobustScaler().fit(pd.DataFrame(X, columns=FEATURES))
+    X_scaled = pd.DataFrame(scaler.transform(pd.DataFrame(X, columns=FEATURES)), columns=FEATURES)
+    model = xgb.XGBRegressor(n_estimators=100, max_depth=6, learning_rate=0.1, random_state=42)
+    model.fit(X_scaled, y)
+
+    model_dir = os.path.join(tempfile.mkdtemp(), "xgboost_model")
+    mlflow.xgboost.save_model(model, model_dir)
+
+    pipelines = {"pyfunc": LegacyPipeline(mlflow.pyfunc.load_model(model_dir), scaler)}
+    for backend in BACKENDS[1:]:
+        pipelines[backend] = InferencePipeline(
+            scaler.center_, scaler.scale_, model.get_booster(), FEATURES, backend
+        )
+    return pipelines
+
+
+def measure(pipeline, X: np.ndarray, repeats: int):
+    pipeline.predict_array(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pipeline.predict_array(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run-id", help="MLflow run id (미지정 시 합성 모델)")
+    args = parser.parse_args()
+
+    if args.run_id:
+        pipelines = {backend: load_pipeline(args.run_id, backend=backend) for backend in BACKENDS}
+    else:
+        pipelines = build_synthetic_pipelines()
+
+    X_all = synthetic_features(max(SIZES), seed=2)
+
+    # ✅ backend 간 예측값 일치 확인 (native 기준)
+    reference = pipelines["native"].predict_array(X_all[:10_000])
+    for backend, pipeline in pipelines.items():
+        diff = np.max(np.abs(pipeline.predict_array(X_all[:10_000]) - reference))
+        print(f"📌 {backend:8s} 최대 오차 (vs native): {diff:.2e}")
+
+    print(f"\n{'rows':>8s} {'backend':>8s} {'p50 (ms)':>10s} {'p99 (ms)':>10s} {'rows/s':>12s}")
+    for size in SIZES:
+        X = X_all[:size]
+        for backend, pipeline in pipelines.items():
+            p50, p99 = measure(pipeline, X, REPEATS[size])
+            print(f"{size:8d} {backend:>8s} {p50:10.3f} {p99:10.3f} {size / p50 * 1000:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
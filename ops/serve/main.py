@@ -1,10 +1,28 @@
 from router.predict_router import predict_router
+from router.model_registry import model_registry
+from router.micro_batcher import predict_batcher
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 
-app = FastAPI()
+# ✅ Lifespan 이벤트 핸들러 정의
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("🚀 [serve] FastAPI 서버 시작: 모델/scaler 로드 중...")
+    await run_in_threadpool(model_registry.reload)  # ✅ 시작 시 한 번만 로드
+    watcher = asyncio.create_task(model_registry.watch())  # ✅ 백그라운드 버전 체크
+    predict_batcher.start()  # ✅ 단건 예측 micro-batching 시작
+    yield
+    await predict_batcher.stop()
+    watcher.cancel()
+    print("❌ [serve] FastAPI 서버 종료")
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -15,4 +33,4 @@ app.add_middleware(
 app.include_router(predict_router)
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8009, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8009, reload=True)
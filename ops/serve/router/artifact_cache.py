@@ -0,0 +1,144 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Callable, Dict, Optional
+
+ARTIFACT_CACHE_DIR = os.getenv("ARTIFACT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "estate_artifact_cache"))
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))  # ✅ 기본 2GB
+
+
+class S3ObjectStore:
+    """
+    ✅ MinIO(S3) 객체 저장소 접근 (etag 조회 + 다운로드)
+    """
+    def __init__(self, client):
+        self.client = client
+
+    def etag(self, bucket: str, key: str) -> str:
+        return self.client.head_object(Bucket=bucket, Key=key)["ETag"].strip('"')
+
+    def download(self, bucket: str, key: str, dest: str):
+        self.client.download_file(bucket, key, dest)
+
+
+class LocalObjectStore:
+    """
+    ✅ 파일시스템 기반 MinIO 대용 객체 저장소 (테스트 / 로컬 개발용)
+    - root/<bucket>/<key> 경로의 파일을 객체로 취급
+    """
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, bucket, key)
+
+    def put(self, bucket: str, key: str, data: bytes):
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def etag(self, bucket: str, key: str) -> str:
+        with open(self._path(bucket, key), "rb") as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+    def download(self, bucket: str, key: str, dest: str):
+        shutil.copyfile(self._path(bucket, key), dest)
+
+
+class ArtifactCache:
+    """
+    ✅ 모델 / scaler 아티팩트 로컬 디스크 캐시 (content-addressed)
+    - 키: sha256(run id + 아티팩트 경로 + etag) → 버전이 바뀔 때만 다시 다운로드
+    - 임시 디렉토리에 받은 뒤 rename으로 원자적 반영 (동시 요청 / 다중 프로세스에서도 반쯤 쓰인 파일 없음)
+    - 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제
+    """
+    def __init__(self, root: str = ARTIFACT_CACHE_DIR, max_bytes: int = ARTIFACT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(run_id: str, artifact_path: str, etag: str = "") -> str:
+        return hashlib.sha256(f"{run_id}\0{artifact_path}\0{etag}".encode()).hexdigest()
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, run_id: str, artifact_path: str, etag: str = "") -> Optional[str]:
+        entry = os.path.join(self.root, self.key(run_id, artifact_path, etag))
+        if not os.path.isdir(entry):
+            return None
+        os.utime(entry)  # ✅ LRU 기준 시각 갱신
+        return entry
+
+    def get_or_fetch(self, run_id: str, artifact_path: str, fetch: Callable[[str], None],
+                     etag: str = "") -> str:
+        """
+        ✅ 캐시 디렉토리 경로 반환 (없으면 fetch(임시 디렉토리)로 채운 뒤 원자적으로 반영)
+        """
+        entry = self.get(run_id, artifact_path, etag)
+        if entry is not None:
+            return entry
+
+        key = self.key(run_id, artifact_path, etag)
+        with self._lock(key):
+            entry = self.get(run_id, artifact_path, etag)
+            if entry is not None:
+                return entry
+
+            print(f"📌 아티팩트 다운로드: run_id={run_id}, path={artifact_path}")
+            tmp_dir = tempfile.mkdtemp(prefix=f".{key}.", dir=self.root)
+            try:
+                fetch(tmp_dir)
+                entry = os.path.join(self.root, key)
+                try:
+                    os.rename(tmp_dir, entry)
+                except OSError:
+                    # ✅ 다른 프로세스가 먼저 반영한 경우 그 결과 사용
+                    if not os.path.isdir(entry):
+                        raise
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict(keep=key)
+        return entry
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        ✅ 용량 초과 시 오래 사용하지 않은 항목부터 삭제 (방금 추가한 항목은 유지)
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            size = _dir_size(path)
+            entries.append((os.path.getmtime(path), name, path, size))
+            total += size
+
+        for _, name, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            print(f"📌 아티팩트 캐시 정리: {name} ({size} bytes)")
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(dirpath, filename))
+    return total
+
+
+artifact_cache = ArtifactCache()
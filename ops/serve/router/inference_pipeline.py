@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import xgboost as xgb
+
+from .tree_predictor import FlatTreeEnsemble
+
+
+class InferencePipeline:
+    """
+    ✅ 학습 시 저장한 통합 추론 파이프라인 (scaler.npz + model.json)
+    - RobustScaler의 center/scale을 NumPy 배열로 들고 있다가 (X - center) / scale 벡터 연산
+    - 스케일링 결과를 연속된 float32 배열로 만들어 booster에 바로 전달 (pyfunc / pandas 없음)
+    - backend
+        - "native": booster.inplace_predict (기본값)
+        - "dmatrix": DMatrix 생성 후 booster.predict
+        - "numpy": 평탄화한 트리 배열로 순수 NumPy 예측 (FlatTreeEnsemble)
+    """
+    SCALER_FILE = "scaler.npz"
+    MODEL_FILE = "model.json"
+    BACKENDS = ("native", "dmatrix", "numpy")
+
+    def __init__(self, center: np.ndarray, scale: np.ndarray, booster: xgb.Booster, features,
+                 backend: str = "native", flat: FlatTreeEnsemble = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"지원하지 않는 backend: {backend} (가능: {self.BACKENDS})")
+
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.booster = booster
+        self.features = list(features)
+        self.backend = backend
+        if backend == "numpy" and flat is None:
+            flat = FlatTreeEnsemble.from_booster(booster)
+        self.flat = flat
+
+    @classmethod
+    def load(cls, path: str, backend: str = "native") -> "InferencePipeline":
+        with np.load(os.path.join(path, cls.SCALER_FILE)) as params:
+            center = params["center"]
+            scale = params["scale"]
+            features = params["features"].tolist()
+
+        booster = xgb.Booster()
+        booster.load_model(os.path.join(path, cls.MODEL_FILE))
+        return cls(center, scale, booster, features, backend)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        ✅ 원본 입력 → 스케일링된 float32 행렬
+        (법정동코드처럼 자릿수가 큰 값은 float64 상태에서 스케일링한 뒤 float32로 변환해야 학습과 동일)
+        """
+        return np.ascontiguousarray((X - self.center) / self.scale, dtype=np.float32)
+
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.features))
+        X_scaled = self.transform(X)
+
+        if self.backend == "numpy":
+            return self.flat.predict(X_scaled)
+        if self.backend == "dmatrix":
+            return self.booster.predict(xgb.DMatrix(X_scaled, feature_names=self.booster.feature_names))
+        return self.booster.inplace_predict(X_scaled)
@@ -0,0 +1,157 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from .model_registry import model_registry
+
+PREDICT_BATCH_MAX_SIZE = int(os.getenv("PREDICT_BATCH_MAX_SIZE", "64"))  # ✅ 배치당 최대 행 수
+PREDICT_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICT_BATCH_MAX_WAIT_MS", "5"))  # ✅ 첫 요청 이후 최대 대기 시간
+
+# ✅ 배치 크기 히스토그램 버킷 (상한값)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class MicroBatcher:
+    """
+    ✅ 동시에 들어온 단건 /predict/ 요청을 모아 한 번의 벡터 예측으로 처리하는 asyncio micro-batcher
+    - 첫 요청 도착 후 max_wait_ms 까지 또는 max_batch_size 행이 모일 때까지 대기
+    - 예측은 worker thread에서 실행하여 이벤트 루프를 막지 않음
+    - 각 요청의 future에 자기 행의 결과만 전달 (예측한 모델의 run id와 함께)
+    """
+    def __init__(self, predict_fn: Callable[[np.ndarray], Tuple[str, np.ndarray]],
+                 max_batch_size: int = PREDICT_BATCH_MAX_SIZE,
+                 max_wait_ms: float = PREDICT_BATCH_MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._pending: Deque[Tuple[Sequence[float], asyncio.Future, float]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # ✅ 튜닝용 지표
+        self._batches = 0
+        self._rows = 0
+        self._histogram: Dict[str, int] = {str(b): 0 for b in BATCH_SIZE_BUCKETS}
+        self._histogram["+Inf"] = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._predict_total = 0.0
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        # ✅ 처리되지 못한 요청은 에러로 종료
+        while self._pending:
+            _, future, _ = self._pending.popleft()
+            if not future.done():
+                future.set_exception(RuntimeError("예측 서버가 종료 중입니다."))
+
+    async def submit(self, row: Sequence[float]) -> Tuple[str, float]:
+        """
+        ✅ 한 행을 큐에 넣고 배치 예측 결과를 기다림 → (run_id, 예측값)
+        """
+        if self._task is None:
+            raise RuntimeError("MicroBatcher가 시작되지 않았습니다.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future, time.perf_counter()))
+        self._wakeup.set()
+        return await future
+
+    async def _collect(self) -> List[Tuple[Sequence[float], asyncio.Future, float]]:
+        """
+        ✅ 가장 오래된 요청 기준으로 max_wait 동안 (또는 max_batch_size까지) 요청을 모음
+        """
+        while not self._pending:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+        deadline = self._pending[0][2] + self.max_wait
+        while len(self._pending) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+
+        size = min(len(self._pending), self.max_batch_size)
+        return [self._pending.popleft() for _ in range(size)]
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # ✅ 취소된 요청(클라이언트 연결 종료 등)은 제외
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            X = np.asarray([row for row, _, _ in batch], dtype=np.float64)
+            try:
+                run_id, predictions = await run_in_threadpool(self.predict_fn, X)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self._record(batch, started)
+
+            for (_, future, _), prediction in zip(batch, predictions):
+                if not future.done():
+                    future.set_result((run_id, float(prediction)))
+
+    def _record(self, batch, started: float):
+        now = time.perf_counter()
+        size = len(batch)
+        self._batches += 1
+        self._rows += size
+        self._predict_total += now - started
+
+        bucket = next((str(b) for b in BATCH_SIZE_BUCKETS if size <= b), "+Inf")
+        self._histogram[bucket] += 1
+
+        for _, _, enqueued in batch:
+            wait = started - enqueued
+            self._wait_total += wait
+            self._wait_max = max(self._wait_max, wait)
+
+    def stats(self) -> dict:
+        """
+        ✅ 큐 길이 / 배치 크기 분포 / 대기 시간 지표
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": len(self._pending),
+            "batches": self._batches,
+            "rows": self._rows,
+            "avg_batch_size": self._rows / self._batches if self._batches else 0.0,
+            "batch_size_histogram": dict(self._histogram),
+            "avg_wait_ms": self._wait_total / self._rows * 1000 if self._rows else 0.0,
+            "max_wait_ms_observed": self._wait_max * 1000,
+            "avg_predict_ms": self._predict_total / self._batches * 1000 if self._batches else 0.0,
+        }
+
+
+predict_batcher = MicroBatcher(model_registry.predict_array_with_run_id)
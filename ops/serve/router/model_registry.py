@@ -0,0 +1,182 @@
+import os
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from mlflow.tracking import MlflowClient
+from starlette.concurrency import run_in_threadpool
+
+from .model_selection import FEATURES, load_pipeline
+
+# ✅ 기존에 하드코딩되어 있던 run id (MODEL_RUN_ID 미지정 + 최신 run 조회 실패 시 사용)
+DEFAULT_RUN_ID = "e4e30f12c37345c3ae85c32aee811462"
+
+MODEL_RUN_ID = os.getenv("MODEL_RUN_ID")  # ✅ 지정하면 해당 run으로 고정 (자동 교체 안 함)
+MODEL_EXPERIMENT_NAME = os.getenv("MODEL_EXPERIMENT_NAME", "xgboost_optuna")
+MODEL_ARTIFACT_PATH = os.getenv("MODEL_ARTIFACT_PATH", "xgboost_model")
+MODEL_POLL_INTERVAL = int(os.getenv("MODEL_POLL_INTERVAL", "60"))  # ✅ 0이면 버전 체크 비활성화
+MODEL_KEEP_VERSIONS = 2  # ✅ 메모리에 유지할 run 개수 (현재 + 직전)
+
+
+class ModelBundle:
+    """
+    ✅ 하나의 MLflow run에서 로드한 추론 파이프라인 (scaler + 모델)
+    - 요청 처리 중에는 bundle 참조를 잡고 있으므로 교체되어도 안전함
+    """
+    def __init__(self, run_id: str, pipeline):
+        self.run_id = run_id
+        self.pipeline = pipeline
+
+    def predict(self, data):
+        return self.predict_array(np.asarray(data, dtype=np.float64).reshape(-1, len(FEATURES)))
+
+    def predict_array(self, X):
+        return self.pipeline.predict_array(X)
+
+
+class ModelRegistry:
+    """
+    ✅ 예측 서비스용 in-process 모델 레지스트리
+    - 서버 시작 시 모델과 RobustScaler를 한 번만 로드하여 메모리에 유지 (run id 기준)
+    - reload()로 새 run을 로드한 뒤 참조만 교체 → 진행 중인 요청은 기존 bundle로 끝까지 처리
+    - watch()에서 주기적으로 실험의 최신 run을 확인하여 자동 교체
+    """
+    def __init__(self, experiment_name: str = MODEL_EXPERIMENT_NAME,
+                 artifact_path: str = MODEL_ARTIFACT_PATH,
+                 pinned_run_id: Optional[str] = MODEL_RUN_ID):
+        self.experiment_name = experiment_name
+        self.artifact_path = artifact_path
+        self.pinned_run_id = pinned_run_id
+        self._bundles: Dict[str, ModelBundle] = {}
+        self._active: Optional[ModelBundle] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+
+    @property
+    def active(self) -> ModelBundle:
+        bundle = self._active
+        if bundle is None:
+            raise RuntimeError("로드된 모델이 없습니다.")
+        return bundle
+
+    @property
+    def run_id(self) -> Optional[str]:
+        bundle = self._active
+        return bundle.run_id if bundle else None
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """
+        ✅ 모델 교체 시 호출될 콜백 등록 (예: 예측 캐시 무효화)
+        """
+        self._listeners.append(callback)
+
+    def predict(self, data):
+        """
+        ✅ 현재 활성화된 모델로 예측 (I/O 없음)
+        """
+        return self.active.predict(data)
+
+    def predict_array(self, X):
+        """
+        ✅ NumPy 행렬 단위 배치 예측
+        """
+        return self.active.predict_array(X)
+
+    def predict_array_with_run_id(self, X) -> Tuple[str, np.ndarray]:
+        """
+        ✅ 배치 예측 + 실제로 예측한 모델의 run id (예측 도중 모델이 교체되어도 결과와 run id가 일치)
+        """
+        bundle = self.active
+        return bundle.run_id, bundle.predict_array(X)
+
+    def latest_run_id(self) -> Optional[str]:
+        """
+        ✅ 실험에서 가장 최근에 완료된 run id 조회
+        """
+        client = MlflowClient()
+        experiment = client.get_experiment_by_name(self.experiment_name)
+        if experiment is None:
+            return None
+
+        runs = client.search_runs(
+            experiment_ids=[experiment.experiment_id],
+            filter_string="attributes.status = 'FINISHED'",
+            order_by=["attributes.start_time DESC"],
+            max_results=1,
+        )
+        return runs[0].info.run_id if runs else None
+
+    def resolve_run_id(self) -> str:
+        if self.pinned_run_id:
+            return self.pinned_run_id
+        try:
+            return self.latest_run_id() or DEFAULT_RUN_ID
+        except Exception as e:
+            print(f"🚨 최신 run 조회 실패, 기본 run 사용: {e}")
+            return DEFAULT_RUN_ID
+
+    def _load_bundle(self, run_id: str, force: bool = False) -> ModelBundle:
+        bundle = self._bundles.get(run_id)
+        if bundle is not None and not force:
+            return bundle
+
+        print(f"📌 모델 로드 중: run_id={run_id}")
+        return ModelBundle(run_id, load_pipeline(run_id, self.artifact_path))
+
+    def reload(self, run_id: Optional[str] = None, force: bool = False) -> ModelBundle:
+        """
+        ✅ 모델을 (다시) 로드하고 활성 bundle을 원자적으로 교체
+        - 로드는 락 밖에서 수행하여 교체 전까지 기존 모델로 계속 서빙
+        - force=True면 이미 메모리에 있는 run도 다시 다운로드
+        """
+        run_id = run_id or self.resolve_run_id()
+        bundle = self._load_bundle(run_id, force=force)
+
+        with self._lock:
+            previous = self._active
+            # ✅ 활성 run을 가장 최근 위치로 이동
+            self._bundles.pop(run_id, None)
+            self._bundles[run_id] = bundle
+            self._active = bundle
+
+            # ✅ 오래된 run은 메모리에서 제거
+            while len(self._bundles) > MODEL_KEEP_VERSIONS:
+                del self._bundles[next(iter(self._bundles))]
+
+        print(f"✅ 활성 모델 교체 완료: run_id={run_id}")
+
+        if previous is not bundle:
+            for callback in self._listeners:
+                try:
+                    callback(run_id)
+                except Exception as e:
+                    print(f"🚨 모델 교체 listener 오류: {e}")
+        return bundle
+
+    def check_for_update(self) -> bool:
+        """
+        ✅ 최신 run이 현재 모델과 다르면 교체
+        """
+        latest = self.latest_run_id()
+        if latest is None or latest == self.run_id:
+            return False
+        self.reload(latest)
+        return True
+
+    async def watch(self, interval: int = MODEL_POLL_INTERVAL):
+        """
+        ✅ 백그라운드 버전 체크 루프 (lifespan에서 task로 실행)
+        """
+        if interval <= 0 or self.pinned_run_id:
+            return
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.check_for_update)
+            except Exception as e:
+                print(f"🚨 모델 버전 체크 실패: {e}")
+
+
+model_registry = ModelRegistry()
@@ -1,66 +1,181 @@
 import os
 import pickle
-import tempfile
 import mlflow
+import numpy as np
 import pandas as pd
 import boto3
+import xgboost as xgb
 from botocore.client import Config
+from .inference_pipeline import InferencePipeline
+from .tree_predictor import FlatTreeEnsemble
+from .artifact_cache import ArtifactCache, S3ObjectStore, artifact_cache
 
 # 모델 학습 시 사용한 feature 순서 (Preprocessor와 동일)
 FEATURES = ["층", "법정동코드", "건축년도", "건물면적_㎡"]
 
+# 학습 시 scaler + booster를 함께 저장한 통합 추론 파이프라인 경로
+PIPELINE_ARTIFACT_PATH = "estate_pipeline"
+
+# 예측 backend: native(inplace_predict) / dmatrix / numpy(평탄화 트리) / pyfunc(mlflow 래퍼)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "native")
+
+# mlflow.xgboost.log_model이 저장하는 booster 파일명 후보
+BOOSTER_FILES = ("model.xgb", "model.json", "model.ubj")
+
 os.environ["MLFLOW_S3_ENDPOINT_URL"] = "http://mlflow-artifact-store:9000"
 os.environ["AWS_ACCESS_KEY_ID"] = "mastermino"
 os.environ["AWS_SECRET_ACCESS_KEY"] = "master1234!"
 os.environ["MLFLOW_TRACKING_URI"] = "http://mlflow-server:5000"
 
-def load_scaler_from_minio(bucket_name: str, object_name: str):
-    s3 = boto3.client(
-        "s3",
-        endpoint_url=os.getenv("MLFLOW_S3_ENDPOINT_URL"),
-        aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-        aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        config=Config(signature_version="s3v4"),
-        region_name="us-east-1"
-    )
-    # 임시 파일 경로 생성
-    tmp_dir = tempfile.gettempdir()
-    tmp_path = os.path.join(tmp_dir, "temp_scaler.pkl")
+_object_store = None
+
+
+def get_object_store():
+    """
+    ✅ MinIO 객체 저장소 (boto3 클라이언트는 처음 사용할 때 한 번만 생성)
+    """
+    global _object_store
+    if _object_store is None:
+        s3 = boto3.client(
+            "s3",
+            endpoint_url=os.getenv("MLFLOW_S3_ENDPOINT_URL"),
+            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+            config=Config(signature_version="s3v4"),
+            region_name="us-east-1"
+        )
+        _object_store = S3ObjectStore(s3)
+    return _object_store
+
 
-    # S3에서 임시 파일로 다운로드
-    s3.download_file(bucket_name, object_name, tmp_path)
+def load_scaler_from_minio(bucket_name: str, object_name: str, store=None, cache: ArtifactCache = None):
+    """
+    ✅ MinIO의 scaler 객체 로드 (로컬 아티팩트 캐시 사용)
+    - etag가 같으면 다운로드 없이 로컬 디스크에서 바로 로드
+    - 요청마다 고유한 임시 디렉토리에 받은 뒤 원자적으로 반영 (고정 temp 경로 경쟁 없음)
+    store: 객체 저장소 (테스트에서는 LocalObjectStore 주입)
+    """
+    store = store or get_object_store()
+    cache = cache or artifact_cache
+    filename = os.path.basename(object_name)
+
+    etag = store.etag(bucket_name, object_name)
+    entry = cache.get_or_fetch(
+        run_id=f"minio:{bucket_name}",
+        artifact_path=object_name,
+        etag=etag,
+        fetch=lambda dest: store.download(bucket_name, object_name, os.path.join(dest, filename)),
+    )
 
     # 파일 열어서 pickle 로드
-    with open(tmp_path, "rb") as f:
-        scaler = pickle.load(f)
+    with open(os.path.join(entry, filename), "rb") as f:
+        return pickle.load(f)
 
-    # 필요에 따라 임시 파일 삭제 (자동 삭제되지 않으므로)
-    os.remove(tmp_path)
 
-    return scaler
+def download_run_artifact(run_id: str, artifact_path: str, cache: ArtifactCache = None) -> str:
+    """
+    ✅ MLflow run 아티팩트를 로컬 캐시로 다운로드 후 경로 반환
+    - 완료된 run의 아티팩트는 변하지 않으므로 run id + 경로로 캐싱 (재시작 시 다운로드 없음)
+    """
+    cache = cache or artifact_cache
+    entry = cache.get_or_fetch(
+        run_id=run_id,
+        artifact_path=artifact_path,
+        fetch=lambda dest: mlflow.artifacts.download_artifacts(
+            artifact_uri=f"runs:/{run_id}/{artifact_path}", dst_path=dest
+        ),
+    )
+    return os.path.join(entry, os.path.basename(artifact_path.rstrip("/")))
 
 
-def load_func(data):
+def load_flat_trees(run_id: str, booster: xgb.Booster, cache: ArtifactCache = None) -> FlatTreeEnsemble:
     """
-    data: 예측에 사용할 데이터. 예를 들어, 리스트의 리스트 또는 dict 형식.
-    예: [[3, 110101, 2005, 85.0]]
+    ✅ numpy backend용 평탄화 트리를 캐시에 저장해 두고 memory-map으로 로드
+    """
+    cache = cache or artifact_cache
+    entry = cache.get_or_fetch(
+        run_id=run_id,
+        artifact_path="flat_trees",
+        fetch=lambda dest: FlatTreeEnsemble.from_booster(booster).save(dest),
+    )
+    return FlatTreeEnsemble.load(entry, mmap=True)
 
-    저장된 scaler를 통해 입력 데이터를 스케일링한 후 MLflow에 저장된 모델로 예측합니다.
+
+def load_model(run_id: str, artifact_path: str = "xgboost_model"):
+    """
+    ✅ MLflow에 저장된 모델을 run id 기준으로 로드
     """
-    # MLflow 모델 URI (실제 모델 URI에 맞게 수정)
-    logged_model = 'runs:/e4e30f12c37345c3ae85c32aee811462/xgboost_model'
-    loaded_model = mlflow.pyfunc.load_model(logged_model)
+    logged_model = f"runs:/{run_id}/{artifact_path}"
+    return mlflow.pyfunc.load_model(logged_model)
+
 
-    # 입력 데이터를 DataFrame으로 변환 (컬럼명은 FEATURES 순서와 일치해야 함)
-    df = pd.DataFrame(data, columns=FEATURES)
+def load_booster(run_id: str, artifact_path: str = "xgboost_model") -> xgb.Booster:
+    """
+    ✅ MLflow xgboost 아티팩트에서 booster를 직접 로드 (pyfunc 래퍼 / 스키마 검사 없이)
+    """
+    local_dir = download_run_artifact(run_id, artifact_path)
+    for name in BOOSTER_FILES:
+        path = os.path.join(local_dir, name)
+        if os.path.exists(path):
+            booster = xgb.Booster()
+            booster.load_model(path)
+            return booster
+    raise FileNotFoundError(f"booster 파일을 찾을 수 없습니다: {local_dir} ({BOOSTER_FILES})")
+
+
+def scale_array(scaler, X: np.ndarray) -> np.ndarray:
+    """
+    ✅ NumPy 행렬을 한 번에 스케일링 (DataFrame 변환 없이)
+    - RobustScaler: (X - center_) / scale_ 를 벡터 연산으로 직접 계산
+    """
+    center = getattr(scaler, "center_", None)
+    scale = getattr(scaler, "scale_", None)
+    if center is None or scale is None:
+        return scaler.transform(X)
+    return (X - center) / scale
 
-    # MinIO에서 저장된 scaler 객체 로드 (예: bucket "mlflow", 객체 "scaler.pkl")
-    scaler = load_scaler_from_minio(bucket_name="mlflow", object_name="scaler.pkl")
 
-    # scaler를 사용하여 입력 데이터 스케일링
-    df_scaled = pd.DataFrame(scaler.transform(df), columns=FEATURES)
+class LegacyPipeline:
+    """
+    ✅ mlflow.pyfunc 래퍼를 거치는 예측기 (MODEL_BACKEND=pyfunc, 비교/디버깅용)
+    - pyfunc 모델 + MinIO의 scaler.pkl 조합
+    """
+    def __init__(self, model, scaler):
+        self.model = model
+        self.scaler = scaler
+
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        """
+        ✅ 여러 행을 한 번의 scaler / predict 호출로 예측
+        X: (n_rows, len(FEATURES)) 형태의 NumPy 행렬
+        """
+        X_scaled = scale_array(self.scaler, np.asarray(X, dtype=np.float64))
+        predictions = self.model.predict(pd.DataFrame(X_scaled, columns=FEATURES))
+        return np.asarray(predictions)
+
+
+def load_pipeline(run_id: str, artifact_path: str = "xgboost_model", backend: str = MODEL_BACKEND):
+    """
+    ✅ run id에 해당하는 추론 파이프라인 로드 (아티팩트는 로컬 캐시 경유)
+    - 학습 시 저장된 estate_pipeline(scaler + booster 통합 아티팩트)이 있으면 사용
+    - 없으면(이전 run) xgboost_model 아티팩트에서 booster를 직접 꺼내고 scaler.pkl과 조합
+    - backend="pyfunc"이면 기존 mlflow.pyfunc 경로 사용
+    """
+    if backend == "pyfunc":
+        model = load_model(run_id, artifact_path)
+        scaler = load_scaler_from_minio(bucket_name="mlflow", object_name="scaler.pkl")
+        return LegacyPipeline(model, scaler)
+
+    try:
+        pipeline = InferencePipeline.load(download_run_artifact(run_id, PIPELINE_ARTIFACT_PATH))
+    except Exception as e:
+        print(f"📌 통합 파이프라인 없음, booster + scaler.pkl 사용 (run_id={run_id}): {e}")
+        booster = load_booster(run_id, artifact_path)
+        scaler = load_scaler_from_minio(bucket_name="mlflow", object_name="scaler.pkl")
+        pipeline = InferencePipeline(scaler.center_, scaler.scale_, booster, FEATURES)
 
-    # 스케일링된 데이터로 예측 수행
-    predictions = loaded_model.predict(df_scaled)
+    if backend == "native":
+        return pipeline
 
-    return predictions
+    flat = load_flat_trees(run_id, pipeline.booster) if backend == "numpy" else None
+    return InferencePipeline(pipeline.center, pipeline.scale, pipeline.booster, pipeline.features, backend, flat)
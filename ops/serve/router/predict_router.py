@@ -1,7 +1,17 @@
-from fastapi import APIRouter, HTTPException
-from .query_schemas import QuerySchemas, Response
-from .model_selection import load_func, FEATURES
+from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from .query_schemas import QuerySchemas, Response, ReloadSchemas, ReloadResponse, BatchQuerySchemas
+from .model_selection import FEATURES
+from .model_registry import model_registry
+from .micro_batcher import predict_batcher
+from .prediction_cache import prediction_cache
+import os
 import numpy as np
+import pandas as pd
+
+BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "1000000"))
+BATCH_STREAM_CHUNK = 10000  # ✅ 응답 스트리밍 시 한 번에 직렬화할 행 수
 
 predict_router = APIRouter(
     prefix="/predict",
@@ -11,7 +21,7 @@ predict_router = APIRouter(
 
 
 @predict_router.post("/", response_model=Response)
-def predict(query: QuerySchemas):
+async def predict(query: QuerySchemas):
     """
     예시 입력: "3,110101,2005,85.0"
     각 값은 모델 학습 시 사용된 피처 순서대로 입력됩니다.
@@ -25,12 +35,131 @@ def predict(query: QuerySchemas):
     if len(values) != len(FEATURES):
         raise HTTPException(status_code=400, detail=f"입력값 개수가 올바르지 않습니다. (예상: {len(FEATURES)}개)")
 
-    # 데이터를 리스트 안에 리스트 형태로 전달 (예: [[...]])
-    data = [values]
+    # ✅ 같은 매물 조건 + 같은 모델이면 캐시된 결과 반환 (스케일링/예측 생략)
+    price = await prediction_cache.get(model_registry.run_id, values)
+    if price is None:
+        try:
+            # ✅ 동시에 들어온 요청들과 묶어서 한 번에 예측 (micro-batching)
+            run_id, prediction = await predict_batcher.submit(values)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"예측 오류: {e}")
+
+        price = float(np.expm1(prediction))
+        # ✅ 대기 중 모델이 교체될 수 있으므로 실제로 예측한 모델의 run id로 캐싱
+        await prediction_cache.set(run_id, values, price)
+
+    return Response(response=str(np.float32(price)))
+
+
+@predict_router.get("/metrics")
+def get_metrics():
+    """
+    ✅ 예측 지표 조회
+    - batcher: 큐 길이, 배치 크기 분포, 대기 시간
+    - cache: 예측 캐시 hit/miss
+    """
+    return {
+        "run_id": model_registry.run_id,
+        "batcher": predict_batcher.stats(),
+        "cache": prediction_cache.stats(),
+    }
+
 
+def _run_batch(X: np.ndarray):
+    """
+    ✅ 배치 예측 공통 처리: 행렬 전체를 한 번에 스케일링/예측 후 np.expm1 벡터 적용
+    """
+    if X.shape[0] == 0:
+        raise HTTPException(status_code=400, detail="예측할 데이터가 없습니다.")
+    if X.shape[0] > BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {BATCH_MAX_ROWS}행까지 예측할 수 있습니다.")
+    if not np.isfinite(X).all():
+        raise HTTPException(status_code=400, detail="입력값에 NaN 또는 무한대 값이 포함되어 있습니다.")
+
+    bundle = model_registry.active  # ✅ 배치 도중 모델이 교체되어도 같은 모델로 끝까지 처리
     try:
-        predictions = load_func(data)
+        prices = np.expm1(bundle.predict_array(X))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"예측 오류: {e}")
 
-    return Response(response=str(np.expm1(predictions[0])))
+    return StreamingResponse(
+        _stream_predictions(prices),
+        media_type="application/json",
+        headers={"X-Model-Run-Id": bundle.run_id},
+    )
+
+
+def _stream_predictions(prices: np.ndarray):
+    """
+    ✅ {"predictions": [...]} JSON을 청크 단위로 직렬화하여 전송
+    """
+    yield '{"predictions":['
+    for start in range(0, len(prices), BATCH_STREAM_CHUNK):
+        chunk = prices[start:start + BATCH_STREAM_CHUNK]
+        prefix = "," if start else ""
+        yield prefix + ",".join(map(repr, chunk.tolist()))
+    yield "]}"
+
+
+@predict_router.post("/batch")
+def predict_batch(query: BatchQuerySchemas):
+    """
+    ✅ 여러 매물을 한 번에 예측하는 배치 API (컬럼 단위 입력)
+    예시 입력: {"columns": {"층": [3, 5], "법정동코드": [110101, 110102], "건축년도": [2005, 2010], "건물면적_㎡": [85.0, 59.9]}}
+    """
+    missing = [f for f in FEATURES if f not in query.columns]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"누락된 컬럼: {missing} (필요: {FEATURES})")
+
+    lengths = {len(query.columns[f]) for f in FEATURES}
+    if len(lengths) != 1:
+        raise HTTPException(status_code=400, detail="모든 컬럼의 길이가 같아야 합니다.")
+
+    # ✅ 컬럼 리스트를 FEATURES 순서의 (n, 4) 행렬로 변환
+    X = np.column_stack([np.asarray(query.columns[f], dtype=np.float64) for f in FEATURES])
+    return _run_batch(X)
+
+
+@predict_router.post("/batch/file")
+def predict_batch_file(file: UploadFile = File(...)):
+    """
+    ✅ CSV / Parquet 파일 업로드 배치 예측
+    - 파일에는 FEATURES 컬럼이 모두 포함되어 있어야 함 (다른 컬럼은 무시)
+    """
+    filename = (file.filename or "").lower()
+    try:
+        if filename.endswith(".parquet"):
+            df = pd.read_parquet(file.file, columns=FEATURES)
+        else:
+            df = pd.read_csv(file.file, usecols=FEATURES)
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"파일 형식 오류: {e} (필요 컬럼: {FEATURES})")
+    except ImportError as e:
+        raise HTTPException(status_code=500, detail=f"Parquet 처리 라이브러리 없음: {e}")
+
+    X = df[FEATURES].to_numpy(dtype=np.float64)
+    return _run_batch(X)
+
+
+@predict_router.post("/reload", response_model=ReloadResponse)
+async def reload_model(body: ReloadSchemas = ReloadSchemas()):
+    """
+    ✅ 모델 다시 로드 (run_id 미지정 시 최신 run)
+    - 새 모델 로드가 끝난 뒤 교체되므로 진행 중인 요청은 영향 없음
+    """
+    try:
+        bundle = await run_in_threadpool(model_registry.reload, body.run_id, body.force)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"모델 로드 오류: {e}")
+
+    return ReloadResponse(run_id=bundle.run_id)
+
+
+@predict_router.get("/model", response_model=ReloadResponse)
+def get_model():
+    """
+    ✅ 현재 서빙 중인 모델의 run id 조회
+    """
+    if model_registry.run_id is None:
+        raise HTTPException(status_code=503, detail="로드된 모델이 없습니다.")
+    return ReloadResponse(run_id=model_registry.run_id)
@@ -0,0 +1,137 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+from .model_registry import model_registry
+
+PREDICT_CACHE_SIZE = int(os.getenv("PREDICT_CACHE_SIZE", "100000"))  # ✅ 0이면 캐시 비활성화
+PREDICT_CACHE_TTL = int(os.getenv("PREDICT_CACHE_TTL", "3600"))  # ✅ 초 단위
+PREDICT_CACHE_REDIS_URL = os.getenv("PREDICT_CACHE_REDIS_URL")  # ✅ 지정하면 replica 간 공유 캐시 사용
+
+
+def normalize_features(values: Sequence[float]) -> Tuple[float, ...]:
+    """
+    ✅ 캐시 키용 feature 정규화
+    - "3", "3.0", "03" 처럼 표현만 다른 입력이 같은 키가 되도록 float 변환 후 반올림
+    """
+    return tuple(round(float(v), 4) + 0.0 for v in values)  # ✅ +0.0: -0.0 → 0.0
+
+
+class PredictionCache:
+    """
+    ✅ 예측 결과 LRU + TTL 캐시 (선택적으로 Redis 공유 캐시 사용)
+    - 키: (활성 모델 run id, 정규화된 feature tuple)
+    - 모델이 교체되면 model_registry listener를 통해 로컬 캐시를 비움
+      (Redis 키에도 run id가 포함되므로 이전 모델의 결과는 조회되지 않음)
+    """
+    def __init__(self, max_entries: int = PREDICT_CACHE_SIZE, ttl: int = PREDICT_CACHE_TTL,
+                 redis_url: Optional[str] = PREDICT_CACHE_REDIS_URL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+
+        if redis_url and max_entries > 0:
+            import redis.asyncio as aioredis  # ✅ Redis 사용 시에만 필요
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _redis_key(key: tuple) -> str:
+        run_id, features = key
+        return f"predict:{run_id}:{','.join(map(repr, features))}"
+
+    def _get_local(self, key: tuple) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: tuple, value: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get(self, run_id: str, values: Sequence[float]) -> Optional[float]:
+        if not self.enabled:
+            return None
+
+        key = (run_id, normalize_features(values))
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(self._redis_key(key))
+            except Exception as e:
+                print(f"🚨 예측 캐시 Redis 조회 실패: {e}")
+                cached = None
+            if cached is not None:
+                self.redis_hits += 1
+                self._set_local(key, float(cached))
+                return float(cached)
+
+        self.misses += 1
+        return None
+
+    async def set(self, run_id: str, values: Sequence[float], prediction: float):
+        if not self.enabled:
+            return
+
+        key = (run_id, normalize_features(values))
+        self._set_local(key, prediction)
+
+        if self._redis is not None:
+            try:
+                await self._redis.setex(self._redis_key(key), self.ttl, repr(prediction))
+            except Exception as e:
+                print(f"🚨 예측 캐시 Redis 저장 실패: {e}")
+
+    def clear(self, run_id: Optional[str] = None):
+        """
+        ✅ 모델 교체 시 호출 (model_registry listener)
+        """
+        with self._lock:
+            self._entries.clear()
+        self.invalidations += 1
+        print(f"📌 예측 캐시 초기화 (새 모델 run_id={run_id})")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": "memory+redis" if self._redis is not None else "memory",
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.redis_hits) / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+prediction_cache = PredictionCache()
+model_registry.add_listener(prediction_cache.clear)
@@ -1,7 +1,19 @@
 from pydantic import BaseModel
+from typing import Dict, List, Optional
 
 class QuerySchemas(BaseModel):
     query : str
 
 class Response(BaseModel):
-    response : str  
\ No newline at end of file
+    response : str
+
+class ReloadSchemas(BaseModel):
+    run_id : Optional[str] = None  # ✅ 비우면 실험의 최신 run
+    force : bool = False
+
+class ReloadResponse(BaseModel):
+    run_id : str
+
+class BatchQuerySchemas(BaseModel):
+    # ✅ 컬럼 단위 입력: {"층": [...], "법정동코드": [...], "건축년도": [...], "건물면적_㎡": [...]}
+    columns : Dict[str, List[float]]
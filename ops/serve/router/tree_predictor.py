@@ -0,0 +1,129 @@
+import os
+import json
+import numpy as np
+
+# ✅ 예측값을 그대로 사용하는 (identity link) 회귀 objective만 지원
+SUPPORTED_OBJECTIVES = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror")
+ROW_CHUNK = 8192  # ✅ (행 x 트리) 인덱스 행렬 메모리 제한용
+
+
+class FlatTreeEnsemble:
+    """
+    ✅ XGBoost booster를 평탄화한 NumPy 배열 표현 (순수 NumPy 예측용 fallback)
+    - 모든 트리의 노드를 하나의 배열로 이어 붙이고, 각 트리의 루트 위치만 따로 보관
+    - 예측: 모든 행 x 모든 트리를 깊이 단위로 한 번에 내려가는 벡터 연산
+    - save()/load()로 .npy 디렉토리 저장 가능 (xgboost 없이도 예측, load 시 memory-map)
+    """
+    FIELDS = ("left", "right", "feature", "threshold", "default_left", "value", "roots")
+
+    def __init__(self, left, right, feature, threshold, default_left, value, roots,
+                 base_score: float, max_depth: int):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.base_score = float(base_score)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_booster(cls, booster) -> "FlatTreeEnsemble":
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"지원하지 않는 objective: {objective}")
+        if learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError("gbtree booster만 지원합니다.")
+
+        # ✅ xgboost 버전에 따라 "5.2E0" 또는 "[5.2E0]" 형태
+        base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+        trees = learner["gradient_booster"]["model"]["trees"]
+
+        left, right, feature, threshold, default_left, value, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+        for tree in trees:
+            lc = np.asarray(tree["left_children"], dtype=np.int32)
+            rc = np.asarray(tree["right_children"], dtype=np.int32)
+            is_leaf = lc == -1
+
+            # ✅ 트리 내부 인덱스 → 전체 배열 인덱스 (리프는 -1 유지)
+            left.append(np.where(is_leaf, -1, lc + offset))
+            right.append(np.where(is_leaf, -1, rc + offset))
+            feature.append(np.asarray(tree["split_indices"], dtype=np.int32))
+            # ✅ JSON 모델에서 리프 노드의 split_conditions 값이 리프 가중치
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            threshold.append(conditions)
+            value.append(np.where(is_leaf, conditions, 0).astype(np.float32))
+            default_left.append(np.asarray(tree["default_left"], dtype=bool))
+            roots.append(offset)
+
+            max_depth = max(max_depth, _tree_depth(lc, rc))
+            offset += len(lc)
+
+        return cls(
+            np.concatenate(left), np.concatenate(right), np.concatenate(feature),
+            np.concatenate(threshold), np.concatenate(default_left), np.concatenate(value),
+            np.asarray(roots, dtype=np.int32), base_score, max_depth,
+        )
+
+    def save(self, path: str):
+        """
+        ✅ 배열별 .npy 파일로 저장 (np.load(mmap_mode="r")로 복사 없이 로드 가능)
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in self.FIELDS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"base_score": self.base_score, "max_depth": self.max_depth}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FlatTreeEnsemble":
+        mmap_mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls.FIELDS}
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(base_score=meta["base_score"], max_depth=meta["max_depth"], **arrays)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        X: 스케일링된 (n_rows, n_features) float32 행렬
+        """
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), ROW_CHUNK):
+            out[start:start + ROW_CHUNK] = self._predict_chunk(X[start:start + ROW_CHUNK])
+        return out
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+
+        for _ in range(self.max_depth):
+            left = self.left[node]
+            internal = left != -1
+            if not internal.any():
+                break
+
+            x = X[rows, self.feature[node]]
+            # ✅ xgboost 규칙: x < split_condition 이면 왼쪽, 결측값은 default 방향
+            go_left = np.where(np.isnan(x), self.default_left[node], x < self.threshold[node])
+            node = np.where(internal, np.where(go_left, left, self.right[node]), node)
+
+        return self.value[node].sum(axis=1, dtype=np.float32) + np.float32(self.base_score)
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    level = [0]
+    while level:
+        children = [c for n in level for c in (left[n], right[n]) if c != -1]
+        if not children:
+            break
+        depth += 1
+        level = children
+    return depth
@@ -0,0 +1,202 @@
+"""
+✅ 인증이 필요한 API 동시 처리량 부하 테스트
+
+1) http 모드: 실제 서비스에 동시 요청을 보내 처리량 / 지연시간 측정 (변경 전/후 서버에 각각 실행하여 비교)
+    python benchmarks/auth_load_test.py http --target toggle --token <access_token> -n 2000 -c 200
+    python benchmarks/auth_load_test.py http --target create --token <access_token> -n 2000 -c 200
+    python benchmarks/auth_load_test.py http --target all --token <access_token> -n 2000 -c 200
+
+2) auth 모드: Django 없이 로컬 Redis만으로 인증 왕복만 비교
+    - stub 응답자가 auth_request_stream을 읽어 auth_response_{request_id}로 응답 (AuthConsumer 대역)
+    - before: 기존 방식 (요청마다 동기 xadd + pubsub 구독 + listen 블로킹, threadpool에서 실행)
+    - after : util.auth.AuthClient (redis.asyncio, 공유 패턴 구독 1개)
+    - local : 로컬 JWT 검증 + jti 캐시 (캐시 미스일 때만 Redis 왕복)
+    python benchmarks/auth_load_test.py auth -n 2000 -c 200
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import hmac
+import base64
+import hashlib
+import asyncio
+import argparse
+import threading
+
+import httpx
+import numpy as np
+import redis
+import redis.asyncio as aioredis
+
+TARGETS = {
+    "toggle": ("POST", "http://localhost:8002/board_like/post/{i}/toggle", None),
+    "create": ("POST", "http://localhost:8008/board/", {"title": "load test", "content": "load test"}),
+    "all": ("GET", "http://localhost:8008/board/all/", None),
+}
+
+
+def report(name: str, latencies, elapsed: float, errors: int = 0):
+    latencies = np.asarray(latencies) * 1000
+    print(
+        f"{name:>8s}: {len(latencies) / elapsed:9.1f} req/s | "
+        f"p50 {np.percentile(latencies, 50):8.2f} ms | p99 {np.percentile(latencies, 99):8.2f} ms | "
+        f"errors {errors}"
+    )
+
+
+async def run_concurrent(call, n: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    return latencies, time.perf_counter() - start, errors
+
+
+async def http_mode(args):
+    method, url, body = TARGETS[args.target]
+    headers = {"Authorization": f"Bearer {args.token}"}
+    limits = httpx.Limits(max_connections=args.concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def call(i):
+            response = await client.request(method, url.format(i=i % args.items + 1), json=body, headers=headers)
+            response.raise_for_status()
+
+        latencies, elapsed, errors = await run_concurrent(call, args.requests, args.concurrency)
+    report(args.target, latencies, elapsed, errors)
+
+
+def stub_responder(redis_url: str, stop: threading.Event):
+    """
+    ✅ AuthConsumer 대역: 요청을 읽어 바로 성공 응답 발행
+    """
+    r = redis.Redis.from_url(redis_url, decode_responses=True)
+    last_id = "$"
+    while not stop.is_set():
+        messages = r.xread({"auth_request_stream": last_id}, count=500, block=200)
+        for _, msgs in messages or []:
+            pipe = r.pipeline(transaction=False)
+            for msg_id, data in msgs:
+                last_id = msg_id
+                response = {"request_id": data["request_id"], "user": {"id": 1, "username": "load"}}
+                pipe.publish(f"auth_response_{data['request_id']}", json.dumps(response))
+            pipe.execute()
+
+
+def make_access_token(key: str, user_id: int = 1, lifetime: int = 300) -> str:
+    """
+    ✅ SIMPLE_JWT와 같은 형식의 HS256 access token 생성 (Django 없이 테스트용)
+    """
+    def encode(data) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    header = encode({"alg": "HS256", "typ": "JWT"})
+    payload = encode({"token_type": "access", "exp": int(time.time()) + lifetime, "jti": uuid.uuid4().hex, "user_id": user_id})
+    signature = hmac.new(key.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{base64.urlsafe_b64encode(signature).rstrip(b'=').decode()}"
+
+
+def legacy_get_user_info(r: redis.Redis, token: str):
+    """
+    ✅ 변경 전 util/auth.get_user_info 동작 재현 (동기 xadd + 요청별 pubsub + listen 블로킹)
+    (기존 코드는 xadd 후 구독하여 빠른 응답을 놓칠 수 있으므로, 측정이 멈추지 않도록 구독을 먼저 수행)
+    """
+    request_id = str(uuid.uuid4())
+    pubsub = r.pubsub()
+    pubsub.subscribe(f"auth_response_{request_id}")
+    r.xadd("auth_request_stream", {"request_id": request_id, "access_token": token})
+    try:
+        for message in pubsub.listen():
+            if message["type"] == "message":
+                return json.loads(message["data"])["user"]
+    finally:
+        pubsub.close()
+
+
+async def auth_mode(args):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "board"))
+    import util.auth
+    from util.auth import AuthClient
+    from util.redis_client import REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT
+    from util.jwt_verifier import JWT_SIGNING_KEY
+    from starlette.concurrency import run_in_threadpool
+
+    stop = threading.Event()
+    threading.Thread(target=stub_responder, args=(args.redis_url, stop), daemon=True).start()
+    await asyncio.sleep(0.3)
+
+    # ✅ before: FastAPI가 sync 핸들러를 threadpool에서 실행하던 방식
+    pool = redis.ConnectionPool.from_url(args.redis_url, decode_responses=True, max_connections=1000)
+    r = redis.Redis(connection_pool=pool)
+
+    async def legacy_call(i):
+        await run_in_threadpool(legacy_get_user_info, r, "token")
+
+    latencies, elapsed, errors = await run_concurrent(legacy_call, args.requests, args.concurrency)
+    report("before", latencies, elapsed, errors)
+
+    # ✅ after: 공유 구독 AuthClient
+    client = AuthClient()
+    client.redis = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool.from_url(
+        args.redis_url, decode_responses=True, max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT,
+    ))
+    await client.start()
+
+    util.auth.AUTH_LOCAL_VERIFY = False
+
+    async def call(i):
+        await client.get_user_info("Bearer token")
+
+    latencies, elapsed, errors = await run_concurrent(call, args.requests, args.concurrency)
+    report("after", latencies, elapsed, errors)
+
+    # ✅ local: 로컬 JWT 검증 + jti 캐시
+    util.auth.AUTH_LOCAL_VERIFY = True
+    token = make_access_token(JWT_SIGNING_KEY)
+
+    async def local_call(i):
+        await client.get_user_info(f"Bearer {token}")
+
+    latencies, elapsed, errors = await run_concurrent(local_call, args.requests, args.concurrency)
+    report("local", latencies, elapsed, errors)
+
+    await client.stop()
+    stop.set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    http = sub.add_parser("http")
+    http.add_argument("--target", choices=TARGETS, default="toggle")
+    http.add_argument("--token", required=True)
+    http.add_argument("--items", type=int, default=100, help="toggle 대상 게시글 id 범위")
+
+    auth = sub.add_parser("auth")
+    auth.add_argument("--redis-url", default="redis://localhost:6378")
+
+    for p in (http, auth):
+        p.add_argument("-n", "--requests", type=int, default=2000)
+        p.add_argument("-c", "--concurrency", type=int, default=200)
+
+    args = parser.parse_args()
+    asyncio.run(http_mode(args) if args.mode == "http" else auth_mode(args))
+
+
+if __name__ == "__main__":
+    main()
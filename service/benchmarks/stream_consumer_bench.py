@@ -0,0 +1,102 @@
+"""
+✅ Redis Stream consumer 처리량 비교: 기존 메시지 1개씩 (XREADGROUP count=1 + XACK) vs StreamConsumer 배치 + pipeline
+
+- 로컬 Redis (util/redis_client.py 설정, localhost:6378) 필요, DB 불필요
+- like_service LikeConsumer의 좋아요 캐시 갱신 handler를 사용 (Redis 쓰기만 하는 handler)
+- bench: 접두사 stream에 좋아요 이벤트 -n개를 한 번에 넣고 (burst), consumer group이 모두 ACK할 때까지 시간 측정
+  (실제 게시글 캐시와 겹치지 않도록 음수 post_id 사용, 끝나면 삭제)
+- before: 변경 전 process_stream (메시지마다 SETEX + XACK)
+- after : --batch-sizes마다 StreamConsumer (stream마다 consumer --consumers개)
+- 배치에서는 redis-py 응답 파싱(순수 Python)이 병목이 되므로 hiredis 설치 여부에 따라 수치가 크게 달라짐
+
+    python benchmarks/stream_consumer_bench.py -n 100000 --batch-sizes 10,100,500 --consumers 1
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "like"))
+
+STREAM = "bench:post_like_stream"
+GROUP = "bench_consumer_group"
+
+
+async def publish_burst(r, events: int, items: int = 1000):
+    await r.delete(STREAM)
+    await r.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    for start in range(0, events, 1000):
+        pipe = r.pipeline(transaction=False)
+        for i in range(start, min(start + 1000, events)):
+            pipe.xadd(STREAM, {"post_id": -1 - i % items, "user_id": i, "delta": 1, "like_count": i})
+        await pipe.execute()
+
+
+async def drained(r, events: int) -> bool:
+    """
+    ✅ 그룹이 burst 전체를 읽고 모두 ACK했는지 확인
+    """
+    group = next(g for g in await r.xinfo_groups(STREAM) if g["name"] == GROUP)
+    last_id = (await r.xinfo_stream(STREAM))["last-generated-id"]
+    return group["last-delivered-id"] == last_id and group["pending"] == 0
+
+
+async def before(r, events: int):
+    """
+    ✅ 변경 전 LikeConsumer.process_stream: 메시지마다 SETEX + XACK (메시지당 왕복 3번) → 걸린 시간 (초)
+    """
+    start = time.perf_counter()
+    done = 0
+    while done < events:
+        messages = await r.xreadgroup(GROUP, "bench-legacy", {STREAM: ">"}, count=1, block=1000)
+        for stream, msgs in messages:
+            for msg_id, msg_data in msgs:
+                await r.setex(f"like_count:post:{msg_data['post_id']}", 300, msg_data["like_count"])
+                await r.xack(STREAM, GROUP, msg_id)
+                done += 1
+    return time.perf_counter() - start
+
+
+async def after(r, events: int, batch_size: int, consumers: int):
+    from util.like_consumer import LikeConsumer
+
+    consumer = LikeConsumer()
+    consumer.group = GROUP
+    consumer.streams = {STREAM: consumer.handle_post_likes}
+    consumer.batch_size = batch_size
+    consumer.consumers = consumers
+    start = time.perf_counter()
+    await consumer.start()
+    try:
+        while not await drained(r, events):
+            await asyncio.sleep(0.01)
+        return time.perf_counter() - start  # ✅ 종료 대기 (최대 block_ms) 제외
+    finally:
+        await consumer.stop()
+
+
+async def main(args):
+    from util.redis_client import r, close_redis
+
+    runs = [("before", lambda: before(r, args.events))]
+    for batch_size in map(int, args.batch_sizes.split(",")):
+        runs.append((f"batch {batch_size}", lambda b=batch_size: after(r, args.events, b, args.consumers)))
+
+    for name, run in runs:
+        await publish_burst(r, args.events)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):  # ✅ handler 로그 제외
+            elapsed = await run()
+        print(f"{name:>10s}: {args.events / elapsed:10.0f} events/s | {elapsed:7.2f}s")
+
+    await r.delete(STREAM, *[key async for key in r.scan_iter("like_count:post:-*")])
+    await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--events", type=int, default=100_000, help="burst 이벤트 수")
+    parser.add_argument("--batch-sizes", default="10,100,500", help="비교할 배치 크기 (쉼표 구분)")
+    parser.add_argument("--consumers", type=int, default=1, help="stream마다 consumer 수")
+    asyncio.run(main(parser.parse_args()))
@@ -5,14 +5,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from router.board_router import board_router
 from router.comment_router import comment_router
 from util.board_consumer import BoardConsumer
+from util.auth import auth_client
+from util.mapping import like_client
+from util.redis_client import close_redis
+from util.tiered_cache import invalidation_listener, cache_stats
 
 # ✅ Lifespan 이벤트 핸들러 정의
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 [board_service] FastAPI 서버 시작: Redis Consumer 실행 중...")
     consumer = BoardConsumer()
-    consumer.start()  # ✅ Redis Consumer 실행
+    await consumer.start()  # ✅ Redis Consumer 실행 (이벤트 루프 task)
+    await auth_client.start()  # ✅ 인증 응답 공유 구독 시작
+    await like_client.start()  # ✅ like_service 호출용 커넥션 풀 생성
+    await invalidation_listener.start()  # ✅ 다른 프로세스의 캐시 무효화 메시지 구독 (L1 정리)
     yield  # 🚀 앱이 실행된 후 여기까지 실행됨
+    await invalidation_listener.stop()
+    await like_client.stop()
+    await auth_client.stop()
+    await consumer.stop()
+    await close_redis()  # ✅ 공유 Redis 커넥션 풀 정리
     print("❌ [board_service] FastAPI 서버 종료")
 
 # ✅ FastAPI 인스턴스 생성 (lifespan 추가)
@@ -25,12 +37,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Custom-Header"],
+    expose_headers=["X-Custom-Header", "X-Next-Cursor"],
 )
 
 # ✅ 라우터 등록
 app.include_router(board_router)
 app.include_router(comment_router)
 
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    ✅ 캐시별 L1 / L2 적중 수와 적중률 (이 프로세스 기준)
+    """
+    return cache_stats()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8008, reload=True)
@@ -0,0 +1,40 @@
+"""post comment counters
+
+Revision ID: 04eff8e405c4
+Revises: f3996a1776af
+Create Date: 2026-10-18 10:00:00.000000
+
+posts.comment_count는 기존 댓글 수로 채우고, like_count는 like_db에 있으므로
+배포 후 `python -m util.like_sync`로 한 번 동기화
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '04eff8e405c4'
+down_revision: Union[str, None] = 'f3996a1776af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('posts', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('posts', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('comments', sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_posts_like_count_id', 'posts', ['like_count', 'id'], unique=False)
+
+    # ✅ 기존 댓글 수 반영
+    op.execute(
+        "UPDATE posts SET comment_count = "
+        "(SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_like_count_id', table_name='posts')
+    op.drop_column('comments', 'like_count')
+    op.drop_column('posts', 'like_count')
+    op.drop_column('posts', 'comment_count')
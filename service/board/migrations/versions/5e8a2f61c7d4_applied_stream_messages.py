@@ -0,0 +1,32 @@
+"""applied stream messages
+
+Revision ID: 5e8a2f61c7d4
+Revises: 9c1d7e52a0b3
+Create Date: 2026-10-18 15:00:00.000000
+
+좋아요 이벤트(post_like_stream / comment_like_stream) 중복 반영 방지용 메시지 id 기록
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a2f61c7d4'
+down_revision: Union[str, None] = '9c1d7e52a0b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('applied_stream_messages',
+    sa.Column('stream', sa.String(length=64), nullable=False),
+    sa.Column('id_ms', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('id_seq', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.PrimaryKeyConstraint('stream', 'id_ms', 'id_seq')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('applied_stream_messages')
@@ -0,0 +1,40 @@
+"""posts search trgm index
+
+Revision ID: 9c1d7e52a0b3
+Revises: 04eff8e405c4
+Create Date: 2026-10-18 11:00:00.000000
+
+제목 / 내용 부분 검색(ILIKE '%q%')용 pg_trgm GIN 인덱스
+- 형태소 분석기가 없는 tsvector('simple')는 한국어 조사가 붙은 어절을 찾지 못하므로 trigram 사용
+- PostgreSQL 전용 (다른 DB에서는 아무것도 하지 않음)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1d7e52a0b3'
+down_revision: Union[str, None] = '04eff8e405c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_posts_title_trgm', 'posts', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_posts_content_trgm', 'posts', ['content'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_posts_content_trgm', table_name='posts')
+    op.drop_index('ix_posts_title_trgm', table_name='posts')
@@ -0,0 +1,27 @@
+"""posts created_at id index
+
+Revision ID: f3996a1776af
+Revises: b2a799a114a3
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3996a1776af'
+down_revision: Union[str, None] = 'b2a799a114a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ✅ 최신순 keyset 페이지네이션: ORDER BY created_at DESC, id DESC + (created_at, id) < cursor
+    op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -11,8 +11,20 @@ class Post(Base):
     author_id = Column(Integer, nullable=False)  # Django 회원 ID
     created_at = Column(DateTime, default=func.now())
     author_name = Column(String(255), nullable=False)  # ✅ Django에서 가져온 `username`
+    # ✅ 비정규화 카운터 (댓글: 같은 트랜잭션에서 갱신, 좋아요: like_service의 post_like_stream 이벤트로 갱신)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
 
-    comments = relationship("Comment", back_populates="post", cascade="all, delete")
+    # ✅ 삭제 시 댓글은 DB의 ON DELETE CASCADE에 맡김 (비동기 세션에서 댓글을 미리 로드하지 않음)
+    comments = relationship("Comment", back_populates="post", cascade="all, delete", passive_deletes=True)
+
+    # ✅ keyset 페이지네이션용 인덱스 (최신순 / 좋아요순) + 검색용 pg_trgm GIN 인덱스 (PostgreSQL)
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_like_count_id", "like_count", "id"),
+        Index("ix_posts_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_posts_content_trgm", "content", postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}),
+    )
 
 
 class Comment(Base):
@@ -24,5 +36,18 @@ class Comment(Base):
     author_name = Column(String(255), nullable=False)  # ✅ Django에서 가져온 `username`
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=func.now())
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")  # ✅ comment_like_stream 이벤트로 갱신
+
+    post = relationship("Post", back_populates="comments")
+
+
+class AppliedStreamMessage(Base):
+    """
+    ✅ DB에 반영한 Redis Stream 메시지 id (ACK 전에 실패해서 다시 전달된 메시지를 한 번 더 반영하지 않도록)
+    - BoardConsumer가 좋아요 delta와 같은 트랜잭션에서 기록, 다시 전달될 수 없는 (ACK된) 메시지는 주기적으로 삭제
+    """
+    __tablename__ = "applied_stream_messages"
 
-    post = relationship("Post", back_populates="comments")
\ No newline at end of file
+    stream = Column(String(64), primary_key=True)
+    id_ms = Column(BigInteger, primary_key=True, autoincrement=False)  # ✅ stream id "<ms>-<seq>"
+    id_seq = Column(BigInteger, primary_key=True, autoincrement=False)
@@ -1,10 +1,32 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from sqlalchemy.engine import make_url
+
+# ✅ 동기 드라이버 URL → 비동기 드라이버 URL (alembic은 기존 database_url 그대로 사용)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
 class Settings(BaseSettings):
     database_url: str  # ✅ 데이터베이스 URL만 유지
 
+    # ✅ 비동기 엔진 커넥션 풀 설정
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30  # ✅ 풀이 가득 찼을 때 연결 대기 시간 (초)
+    db_pool_recycle: int = 1800  # ✅ 오래된 연결 재생성 주기 (초)
+    db_pool_pre_ping: bool = True  # ✅ 끊긴 연결 사용 방지
+
     class Config:
         env_file = Path(__file__).resolve().parent.parent / ".env"  # ✅ .env 파일에서 불러오기
 
-settings = Settings()
\ No newline at end of file
+    @property
+    def async_database_url(self) -> str:
+        url = make_url(self.database_url)
+        backend = url.get_backend_name()
+        if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+            url = url.set(drivername=ASYNC_DRIVERS[backend])
+        return url.render_as_string(hide_password=False)
+
+settings = Settings()
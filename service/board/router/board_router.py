@@ -1,21 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from sqlalchemy import func
-import redis
-import json
-import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, or_, tuple_
+from datetime import datetime
 
-from model.database import get_db
+from model.database import get_db, SessionLocal
 from model.models import Post, Comment
 
 from dto.post import PostCreate, PostUpdate, PostResponse
 
 from util.auth import get_user_info
-from util.mapping import get_likes_count
+from util.redis_client import r
+from util import ranking
+from util.cache import post_cache, page_cache, rank_page_cache, post_key, post_page_key
+from util.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX, NEXT_CURSOR_HEADER, SEARCH_OFFSET_MAX, encode_cursor, decode_cursor, decode_offset
 
-from typing import Dict, List
+from typing import List, Optional
 
 board_router = APIRouter(
     prefix="/board",
@@ -23,18 +23,12 @@ board_router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-# Caching Ready
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
-
-CACHE_EXPIRE_TIME_POSTS = 60  # ✅ 캐시 TTL (1분)
-CACHE_EXPIRE_TIME_LIKES = 300
-
 @board_router.post("/")
-def create_post(post: PostCreate, authorization: str = Header(...), db: Session = Depends(get_db) ):
+async def create_post(post: PostCreate, authorization: str = Header(...), db: AsyncSession = Depends(get_db) ):
     print(f"📌 Received Authorization Header: {authorization}")  # ✅ 디버깅용 로그 추가
     print(f"📌 Received Post Data: {post.dict()}")
     # ✅ JWT 토큰을 이용하여 Django에서 회원 정보 가져오기
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
 
 
     author_id = user_info["id"]  # ✅ Django에서 가져온 회원 ID
@@ -43,8 +37,9 @@ def create_post(post: PostCreate, authorization: str = Header(...), db: Session
     # ✅ 새로운 게시글 생성
     new_post = Post(title=post.title, content=post.content, author_id=author_id, author_name=author_name)
     db.add(new_post)
-    db.commit()
-    db.refresh(new_post)
+    await db.commit()
+    await db.refresh(new_post)
+    await ranking.add_post(new_post.id)  # ✅ 좋아요 순위에 0점으로 추가
 
     # ✅ Redis Stream에 게시글 생성 이벤트 추가
     event_data = {
@@ -55,63 +50,54 @@ def create_post(post: PostCreate, authorization: str = Header(...), db: Session
         "author": new_post.author_name,
         "created_at": str(new_post.created_at)
     }
-    r.xadd("post_stream", event_data)
+    await r.xadd("post_stream", event_data)
 
     return {"message": "게시글이 등록되었습니다.", "post": event_data}
 
-@board_router.get("/{post_id}")
-async def read_post(post_id: int, db: Session = Depends(get_db)):
+@post_cache.cached(key=post_key)
+async def load_post(post_id: int) -> Optional[dict]:
     """
-    ✅ 특정 게시글을 조회하고, 좋아요 개수를 캐싱하여 반환
+    ✅ 게시글 상세 데이터 (좋아요 / 댓글 개수는 비정규화 컬럼, 없으면 None → 캐싱하지 않음)
+    - 백그라운드 갱신에서도 호출되므로 요청의 세션 대신 자체 세션 사용
     """
-    cache_key = f"post:{post_id}"
-
-    # ✅ 1️⃣ Redis 캐시 확인
-    cached_data = r.get(cache_key)
-    if cached_data:
-        print(f"📌 Redis 캐시에서 게시글 {post_id} 조회")
-        return json.loads(cached_data)
-
-    # ✅ 2️⃣ DB 조회
-    post = db.query(Post).filter(Post.id == post_id).first()
+    async with SessionLocal() as db:
+        post = await db.get(Post, post_id)
     if not post:
-        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+        return None
 
-    # ✅ 3️⃣ 좋아요 개수 캐싱 확인
-    like_cache_key = f"like_count:post:{post_id}"
-    cached_likes = r.get(like_cache_key)
-    if cached_likes is not None:
-        like_count = int(cached_likes)
-    else:
-        like_count = await get_likes_count(post_id, "post")
-        r.setex(like_cache_key, CACHE_EXPIRE_TIME_LIKES, like_count)
-
-    # ✅ 4️⃣ 최종 데이터 구성
-    post_data = {
+    return {
         "id": post.id,
         "title": post.title,
         "content": post.content,
         "author": post.author_name,
         "created_at": post.created_at.isoformat(),  # ✅ JSON 직렬화 가능하도록 변환
-        "like_count": like_count
+        "like_count": post.like_count,
+        "comment_count": post.comment_count
     }
 
-    # ✅ 5️⃣ Redis 캐싱 (5분 TTL 설정)
-    r.setex(cache_key, CACHE_EXPIRE_TIME_POSTS, json.dumps(post_data))
-    print(f"📌 Redis에 게시글 {post_id} 캐싱 완료 (TTL: {CACHE_EXPIRE_TIME_POSTS}초)")
 
+@board_router.get("/{post_id}")
+async def read_post(post_id: int):
+    """
+    ✅ 특정 게시글을 조회하고, 좋아요 개수를 포함하여 캐싱 후 반환
+    - L1(프로세스 내) → L2(Redis) → DB 순으로 조회 (util/tiered_cache.py)
+    - 수정 / 삭제 / 댓글 / 좋아요 이벤트 시 BoardConsumer가 무효화
+    """
+    post_data = await load_post(post_id)
+    if post_data is None:
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     return post_data
 
 
 @board_router.put("/{post_id}/")
-def update_post(post_id: int, post_data: PostUpdate, authorization: str = Header(...), db: Session = Depends(get_db)):
+async def update_post(post_id: int, post_data: PostUpdate, authorization: str = Header(...), db: AsyncSession = Depends(get_db)):
     """
     ✅ 게시글 수정 API (Redis Stream에 추가)
     """
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     author_id = user_info["id"]
 
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     if post.author_id != author_id:
@@ -119,161 +105,258 @@ def update_post(post_id: int, post_data: PostUpdate, authorization: str = Header
 
     post.title = post_data.title
     post.content = post_data.content
-    db.commit()
-    db.refresh(post)
+    await db.commit()
+    await db.refresh(post)
 
     # ✅ Redis Stream에 게시글 수정 이벤트 추가
     event_data = {
         "event_type": "update",
         "post_id": post.id,
         "title": post.title,
-        "content": post.content,
-        "updated_at": str(post.updated_at)
+        "content": post.content
     }
-    r.xadd("post_stream", event_data)
+    await r.xadd("post_stream", event_data)
 
     return {"message": "게시글이 수정되었습니다.", "post": event_data}
 
 # ✅ 게시글 삭제 (Authorization 필수)
 
 @board_router.delete("/{post_id}/")
-def delete_post(post_id: int, authorization: str = Header(...), db: Session = Depends(get_db)):
+async def delete_post(post_id: int, authorization: str = Header(...), db: AsyncSession = Depends(get_db)):
     """
     ✅ 게시글 삭제 API (Redis Stream에 추가)
     """
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     author_id = user_info["id"]
 
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
     if post.author_id != author_id:
         raise HTTPException(status_code=403, detail="본인의 게시글만 삭제할 수 있습니다.")
 
-    db.delete(post)
-    db.commit()
+    # ✅ 함께 삭제되는 댓글 작성자 (회원별 댓글 목록 캐시 무효화용)
+    comment_author_ids = (await db.scalars(
+        select(Comment.author_id).where(Comment.post_id == post_id).distinct()
+    )).all()
+
+    await db.delete(post)
+    await db.commit()
+    await ranking.remove_post(post_id)
 
     # ✅ Redis Stream에 게시글 삭제 이벤트 추가
     event_data = {
         "event_type": "delete",
-        "post_id": post_id
+        "post_id": post_id,
+        "comment_author_ids": ",".join(map(str, comment_author_ids))
     }
-    r.xadd("post_stream", event_data)
+    await r.xadd("post_stream", event_data)
 
     return {"message": "게시글이 삭제되었습니다."}
 
-@board_router.get("/all/", response_model=list[dict])
-async def get_all_posts(db: Session = Depends(get_db)):
+async def fetch_post_page(db: AsyncSession, limit: int, cursor: Optional[str]):
     """
-    ✅ 모든 게시글 조회 API (좋아요 & 댓글 개수 포함)
+    ✅ 최신순 keyset 페이지네이션: (created_at, id) 내림차순, cursor 이후 limit개
+    - OFFSET 없이 ix_posts_created_at_id 인덱스를 cursor 위치부터 limit+1개만 읽음
+    - 반환: (게시글 목록, 다음 페이지 cursor 또는 None)
     """
+    stmt = select(Post).order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1)
+    if cursor:
+        created_at, post_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(tuple_(Post.created_at, Post.id) < (created_at, post_id))
 
-    cache_key = "all_posts"
-
-    # ✅ 1️⃣ Redis에서 캐시된 데이터 확인
-    cached_data = r.get(cache_key)
-    if cached_data:
-        print("📌 Redis 캐시에서 게시글 목록 조회")
-        return json.loads(cached_data)  # ✅ 캐싱된 데이터 반환
+    posts = (await db.scalars(stmt)).all()
+    if len(posts) <= limit:
+        return posts, None
 
-    # ✅ 2️⃣ DB에서 게시글 목록 조회
-    posts = db.query(Post).all()
+    posts = posts[:limit]
+    return posts, encode_cursor(posts[-1].created_at, posts[-1].id)
 
-    if not posts:
-        return []  # ✅ 게시글이 없으면 빈 리스트 반환
 
-    # ✅ 3️⃣ 댓글 개수를 한 번에 조회
-    post_ids = [post.id for post in posts]
-    comment_counts = {
-        post_id: count for post_id, count in
-        db.query(Comment.post_id, func.count(Comment.id))
-          .filter(Comment.post_id.in_(post_ids))
-          .group_by(Comment.post_id)
-          .all()
+async def fetch_post_page_by_likes(db: AsyncSession, limit: int, cursor: Optional[str]):
+    """
+    ✅ 좋아요순 페이지: Redis 좋아요 순위(ZREVRANGE)에서 id를 읽고 IN 쿼리 한 번으로 게시글 조회
+    - cursor는 순위 offset (순위는 계속 바뀌므로 keyset이 아닌 offset 사용, Redis에서 O(log N + limit))
+    - offset은 0 ~ RANK_OFFSET_MAX (음수는 ZREVRANGE에서 순위 끝부터 세므로 거부)
+    - 반환: ([(게시글, 좋아요 수)], 다음 페이지 cursor 또는 None)
+    """
+    offset = decode_offset(cursor, ranking.RANK_OFFSET_MAX)
+    ranked = await ranking.fetch_ranked_posts(db, offset, limit + 1)
+    has_next = len(ranked) > limit and offset + limit <= ranking.RANK_OFFSET_MAX
+    next_cursor = encode_cursor(offset + limit) if has_next else None
+    ranked = ranked[:limit]
+
+    posts = {
+        post.id: post
+        for post in await db.scalars(select(Post).where(Post.id.in_([post_id for post_id, _ in ranked])))
     }
+    # ✅ 순위 순서 유지 (순위에는 있지만 이미 삭제된 게시글은 제외)
+    return [(posts[post_id], like_count) for post_id, like_count in ranked if post_id in posts], next_cursor
 
-    # ✅ 4️⃣ 좋아요 개수를 병렬로 가져오기
-    like_tasks = [get_likes_count(post.id, "post") for post in posts]
-    like_counts = await asyncio.gather(*like_tasks)  # 🚀 병렬 실행
 
-    # ✅ 5️⃣ 최종 데이터 구성 (`created_at`을 문자열로 변환)
-    result = []
-    for idx, post in enumerate(posts):
-        result.append({
+async def load_post_page(limit: int, cursor: Optional[str]) -> dict:
+    """
+    ✅ 최신순 목록 한 페이지 (/all/ 응답 형식)
+    """
+    async with SessionLocal() as db:
+        posts, next_cursor = await fetch_post_page(db, limit, cursor)
+
+    items = []
+    for post in posts:
+        items.append({
             "id": post.id,
             "title": post.title,
             "content": post.content,
             "author_id": post.author_id,
             "author": post.author_name,
             "created_at": post.created_at.isoformat(),  # ✅ JSON 직렬화를 위해 문자열 변환
-            "like_count": like_counts[idx],  # ✅ 비동기 병렬 처리된 좋아요 개수 사용
-            "comment_count": comment_counts.get(post.id, 0)  # ✅ 미리 가져온 댓글 개수 사용
+            "like_count": post.like_count,
+            "comment_count": post.comment_count
         })
+    return {"items": items, "next_cursor": next_cursor}
 
-    # ✅ 6️⃣ Redis에 캐싱 (1분 TTL 설정)
-    r.setex(cache_key, CACHE_EXPIRE_TIME_POSTS, json.dumps(result))
-    print(f"📌 Redis에 게시글 목록 캐싱 완료 (TTL: {CACHE_EXPIRE_TIME_POSTS}초)")
 
-    return result
+async def load_sorted_page(sort_by: str, limit: int, cursor: Optional[str]) -> dict:
+    """
+    ✅ 정렬 기준별 목록 한 페이지 (/sort/ 응답 형식)
+    """
+    async with SessionLocal() as db:
+        if sort_by == "likes":
+            posts, next_cursor = await fetch_post_page_by_likes(db, limit, cursor)
+        else:
+            posts, next_cursor = await fetch_post_page(db, limit, cursor)
+            posts = [(post, post.like_count) for post in posts]
+
+    items = []
+    for post, like_count in posts:
+        items.append({
+            "id": post.id,
+            "title": post.title,
+            "content": post.content,
+            "author_id": post.author_id,
+            "created_at": post.created_at.isoformat(),
+            "like_count": like_count,
+            "comment_count" : post.comment_count
+        })
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def with_like_counts(items: List[dict]) -> List[dict]:
+    """
+    ✅ 캐시된 목록 페이지의 like_count를 현재 좋아요 순위 점수로 교체 (ZMSCORE 한 번)
+    - 좋아요는 목록 페이지 버전을 올리지 않으므로 페이지 캐시의 like_count는 오래됐을 수 있음
+    - 순위에 없으면 (재구성 전 등) 캐시된 값 그대로, 캐시 객체는 수정하지 않음
+    """
+    like_counts = await ranking.fetch_scores([item["id"] for item in items])
+    return [{**item, "like_count": like_counts.get(item["id"], item["like_count"])} for item in items]
+
+
+@board_router.get("/all/", response_model=list[dict])
+async def get_all_posts(
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+):
+    """
+    ✅ 게시글 목록 조회 API (최신순 cursor 페이지네이션, 좋아요 & 댓글 개수 포함)
+    - 페이지 단위로 L1 / L2 캐싱 (게시글 / 댓글 변경 시 BoardConsumer가 페이지 버전을 올림)
+    - like_count는 조회 시 좋아요 순위 점수로 채움 (좋아요는 페이지 버전을 올리지 않음)
+    - 다음 페이지가 있으면 응답 헤더 `X-Next-Cursor`로 cursor 전달
+    """
+    cache_key = await post_page_key(cursor, limit)
+    page = await page_cache.get_or_compute(cache_key, lambda: load_post_page(limit, cursor))
+
+    if page["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return await with_like_counts(page["items"])
 
 @board_router.get("/sort/", response_model=List[dict])  # ✅ 경로 변경 (`/sort/`)
 async def get_posts(
+    response: Response,
     sort_by: str = Query("latest", enum=["latest", "likes"], description="정렬 기준"),
-    db: Session = Depends(get_db)
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
 ):
     """
-    ✅ 게시글 목록 조회 (정렬 가능)
+    ✅ 게시글 목록 조회 (정렬 가능, cursor 페이지네이션, 페이지 단위 캐싱)
     - `latest` : 최신순 정렬 (기본값)
-    - `likes` : 좋아요 많은 순 정렬
+    - `likes` : 좋아요 많은 순 정렬 (순서는 CACHE_EXPIRE_TIME_RANK_PAGE 동안 캐싱)
+    - like_count는 조회 시 좋아요 순위 점수로 채움
+    - 다음 페이지가 있으면 응답 헤더 `X-Next-Cursor`로 cursor 전달
     """
-    if sort_by == "latest":
-        posts = db.query(Post).order_by(desc(Post.created_at)).all()
-    elif sort_by == "likes":
-        posts = db.query(Post).all()
-        posts.sort(key=lambda p: get_likes_count(p.id, "post"), reverse=True)
+    if sort_by == "likes":
+        # ✅ 캐시 전에 offset 검증 + 같은 offset은 같은 cursor로 (조작한 cursor로 캐시 항목이 늘지 않도록)
+        offset = decode_offset(cursor, ranking.RANK_OFFSET_MAX)
+        cursor = encode_cursor(offset) if offset else None
+    cache_key = await post_page_key(cursor, limit, kind=f"sort:{sort_by}")
+    cache = rank_page_cache if sort_by == "likes" else page_cache
+    page = await cache.get_or_compute(cache_key, lambda: load_sorted_page(sort_by, limit, cursor))
 
-    # ✅ 좋아요 개수 포함하여 반환
-    result = []
-    for post in posts:
-        comment_count = db.query(func.count(Comment.id)).filter(Comment.post_id == post.id).scalar()  # ✅ 댓글 개수 조회
-        like_count = await get_likes_count(post.id, "post")
-        result.append({
-            "id": post.id,
-            "title": post.title,
-            "content": post.content,
-            "author_id": post.author_id,
-            "created_at": post.created_at,
-            "like_count": like_count,
-            "comment_count" : comment_count
-        })
+    if page["next_cursor"]:
+        response.headers[NEXT_CURSOR_HEADER] = page["next_cursor"]
+    return await with_like_counts(page["items"])
 
-    return result
+
+def escape_like(q: str) -> str:
+    """
+    ✅ LIKE 패턴 특수문자(%, _, \\) 이스케이프 (검색어를 글자 그대로 찾도록)
+    """
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_post_page(db: AsyncSession, q: str, limit: int, cursor: Optional[str]):
+    """
+    ✅ 제목 / 내용 부분 검색 (PostgreSQL pg_trgm GIN 인덱스)
+    - 필터: title ILIKE '%q%' OR content ILIKE '%q%' → 두 trigram 인덱스 BitmapOr (전체 스캔 없음)
+    - 정렬: 제목 일치를 우선하는 word_similarity 점수 내림차순, 같으면 최신순
+      (점수는 필터를 통과한 행에만 계산)
+    - cursor는 결과 offset (0 ~ SEARCH_OFFSET_MAX, 넘으면 400)
+    - 📌 trigram은 3글자 단위라 1~2글자 검색어는 인덱스 효과가 작음
+    """
+    offset = decode_offset(cursor, SEARCH_OFFSET_MAX)
+    pattern = f"%{escape_like(q)}%"
+    rank = func.word_similarity(q, Post.title) * 2 + func.word_similarity(q, Post.content)
+
+    posts = (await db.scalars(
+        select(Post)
+        .where(or_(Post.title.ilike(pattern, escape="\\"), Post.content.ilike(pattern, escape="\\")))
+        .order_by(rank.desc(), Post.id.desc())
+        .offset(offset)
+        .limit(limit + 1)
+    )).all()
+
+    has_next = len(posts) > limit and offset + limit <= SEARCH_OFFSET_MAX
+    next_cursor = encode_cursor(offset + limit) if has_next else None
+    return posts[:limit], next_cursor
 
 
 @board_router.get("/search/", response_model=List[dict])
 async def search_posts(
-    q: str = Query(..., description="검색할 키워드"),
-    db: Session = Depends(get_db)
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="검색할 키워드"),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    ✅ 게시글 검색 기능 (제목/내용 기준)
+    ✅ 게시글 검색 기능 (제목/내용 기준, 관련도순 cursor 페이지네이션)
+    - 좋아요 / 댓글 개수는 비정규화 컬럼을 그대로 사용 (게시글별 추가 조회 없음)
+    - 다음 페이지가 있으면 응답 헤더 `X-Next-Cursor`로 cursor 전달
     """
-    posts = db.query(Post).filter(
-        Post.title.contains(q) | Post.content.contains(q)
-    ).all()
+    posts, next_cursor = await search_post_page(db, q, limit, cursor)
 
     result = []
     for post in posts:
-        like_count = await get_likes_count(post.id, "post")
-        comment_count = db.query(func.count(Comment.id)).filter(Comment.post_id == post.id).scalar()
         result.append({
             "id": post.id,
             "title": post.title,
             "content": post.content,
             "author_id": post.author_id,
             "created_at": post.created_at,
-            "like_count": like_count,
-            "comment_count": comment_count
+            "like_count": post.like_count,
+            "comment_count": post.comment_count
         })
 
-    return result
\ No newline at end of file
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return result
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
 from model.database import get_db
 from model.models import Comment, Post
 from dto.comment import CommentCreate, CommentResponse
@@ -7,8 +8,7 @@ from util.auth import get_user_info
 from typing import List
 
 
-import redis
-from util.mapping import get_likes_count
+from util.redis_client import r
 
 comment_router = APIRouter(
     prefix="/comment",
@@ -16,20 +16,18 @@ comment_router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
-
 # ✅ 댓글 작성
 @comment_router.post("/{post_id}/")
-def create_comment(
+async def create_comment(
     post_id: int,
     comment_data: CommentCreate,  # ✅ Pydantic 모델 사용
     authorization: str = Header(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     ✅ 댓글 작성 API (Redis Stream에 추가)
     """
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     author_id = user_info["id"]
     author_name = user_info["username"]
 
@@ -40,99 +38,128 @@ def create_comment(
         author_name=author_name
     )
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+
+    # ✅ 게시글 댓글 수 증가 (댓글 추가와 같은 트랜잭션)
+    result = await db.execute(
+        update(Post).where(Post.id == post_id).values(comment_count=Post.comment_count + 1)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="게시글을 찾을 수 없습니다.")
+
+    await db.commit()
+    await db.refresh(new_comment)
 
     # ✅ Redis Stream에 댓글 생성 이벤트 추가
     event_data = {
         "event_type": "create",
         "comment_id": new_comment.id,
         "post_id": post_id,
+        "author_id": author_id,
         "content": new_comment.content,
         "author": new_comment.author_name,
         "created_at": str(new_comment.created_at)
     }
-    r.xadd("comment_stream", event_data)
+    await r.xadd("comment_stream", event_data)
 
     return {"message": "댓글이 등록되었습니다.", "comment": event_data}
 
 
 @comment_router.get("/{post_id}/", response_model=list[CommentResponse])
-async def get_comments(post_id: int, db: Session = Depends(get_db)):
+async def get_comments(post_id: int, db: AsyncSession = Depends(get_db)):
     """
     특정 게시글의 댓글 목록 조회 (+ 각 댓글의 좋아요 개수 포함)
     """
-    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
-
-    # ✅ 각 댓글의 좋아요 개수 가져오기 (비동기 처리)
-    for comment in comments:
-        comment.like_count = await get_likes_count(comment.id, "comment")  # ✅ 댓글 좋아요 개수 추가
+    # ✅ 좋아요 개수는 comments.like_count 컬럼 (comment_like_stream 이벤트로 갱신)
+    comments = (await db.scalars(select(Comment).where(Comment.post_id == post_id))).all()
 
     return comments
 
 # ✅ 댓글 수정
 @comment_router.put("/{post_id}/{comment_id}/")
-def update_comment(
+async def update_comment(
     post_id: int,
     comment_id: int,
     authorization: str,
     comment_data: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if not authorization:
         raise HTTPException(status_code=401, detail="인증 토큰이 제공되지 않았습니다.")
 
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     author_id = user_info["id"]
 
-    comment = db.query(Comment).filter(Comment.id == comment_id, Comment.post_id == post_id).first()
+    comment = await db.scalar(select(Comment).where(Comment.id == comment_id, Comment.post_id == post_id))
     if not comment:
         raise HTTPException(status_code=404, detail="댓글을 찾을 수 없습니다.")
     if comment.author_id != author_id:
         raise HTTPException(status_code=403, detail="본인의 댓글만 수정할 수 있습니다.")
 
     comment.content = comment_data.content
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await db.refresh(comment)
+
+    # ✅ Redis Stream에 댓글 수정 이벤트 추가
+    await r.xadd("comment_stream", {
+        "event_type": "update",
+        "comment_id": comment.id,
+        "post_id": post_id,
+        "author_id": author_id,
+        "content": comment.content
+    })
 
     return {"message": "댓글이 수정되었습니다.", "comment": CommentResponse.from_orm(comment)}
 
 # ✅ 댓글 삭제
 @comment_router.delete("/{post_id}/{comment_id}/")
-def delete_comment(
+async def delete_comment(
     post_id: int,
     authorization: str,
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if not authorization:
         raise HTTPException(status_code=401, detail="인증 토큰이 제공되지 않았습니다.")
 
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     author_id = user_info["id"]
 
-    comment = db.query(Comment).filter(Comment.id == comment_id, Comment.post_id == post_id).first()
+    comment = await db.scalar(select(Comment).where(Comment.id == comment_id, Comment.post_id == post_id))
     if not comment:
         raise HTTPException(status_code=404, detail="댓글을 찾을 수 없습니다.")
     if comment.author_id != author_id:
         raise HTTPException(status_code=403, detail="본인의 댓글만 삭제할 수 있습니다.")
 
-    db.delete(comment)
-    db.commit()
+    await db.delete(comment)
+
+    # ✅ 게시글 댓글 수 감소 (댓글 삭제와 같은 트랜잭션)
+    await db.execute(
+        update(Post).where(Post.id == post_id).values(comment_count=Post.comment_count - 1)
+    )
+    await db.commit()
+
+    # ✅ Redis Stream에 댓글 삭제 이벤트 추가
+    await r.xadd("comment_stream", {
+        "event_type": "delete",
+        "comment_id": comment_id,
+        "post_id": post_id,
+        "author_id": author_id
+    })
 
     return {"message": "댓글이 삭제되었습니다."}
 
 @comment_router.get("/user/{user_id}/", response_model=list[CommentResponse])
-async def get_user_comments(user_id: int, db: Session = Depends(get_db)):
+async def get_user_comments(user_id: int, db: AsyncSession = Depends(get_db)):
     """
     특정 회원이 작성한 댓글 목록 조회
     """
-    comments = db.query(Comment).filter(Comment.author_id == user_id).all()
+    comments = (await db.scalars(select(Comment).where(Comment.author_id == user_id))).all()
 
     # ✅ SQLAlchemy 모델을 Pydantic 모델로 변환
     comment_list = []
     for comment in comments:
-        like_count = await get_likes_count(comment.id, "comment")  # ✅ 댓글 좋아요 개수 추가
+        like_count = comment.like_count  # ✅ 댓글 좋아요 개수 (비정규화 컬럼)
         comment_list.append({
             "id": comment.id,
             "post_id": comment.post_id,
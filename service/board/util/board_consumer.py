@@ -1,87 +1,165 @@
-import redis
-import json
-import threading
+from collections import Counter
+from typing import List, Tuple
+from sqlalchemy import select, update, delete, case, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from model.database import SessionLocal
+from model.models import Post, Comment, AppliedStreamMessage
+from util.cache import invalidate
+from util import ranking
+from util.redis_client import r
+from util.stream_consumer import StreamConsumer
 
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
 
-class BoardConsumer:
+def parse_stream_id(msg_id: str) -> Tuple[int, int]:
+    """
+    ✅ stream id "<ms>-<seq>" → (ms, seq) (DB에서 순서 비교용)
+    """
+    ms, seq = msg_id.split("-")
+    return int(ms), int(seq)
+
+
+class BoardConsumer(StreamConsumer):
     """
     ✅ `post_stream`, `comment_stream`을 소비하는 FastAPI1 (board_service) Consumer
-    - `post_stream` → 게시글 생성/수정/삭제 이벤트 처리
-    - `comment_stream` → 댓글 생성/수정/삭제 이벤트 처리
+    - `post_stream` → 게시글 생성/수정/삭제 이벤트로 읽기 캐시 무효화 (util/cache.py)
+    - `comment_stream` → 댓글 생성/수정/삭제 이벤트로 읽기 캐시 무효화
+    - `post_like_stream`, `comment_like_stream` → like_service 좋아요 토글을 posts / comments.like_count에 반영
+    - 배치 단위로 처리 (캐시 무효화는 배치마다 한 번, like_count는 배치마다 UPDATE 한 번)
+    - 좋아요 delta는 메시지 id와 같은 트랜잭션에서 반영 → 다시 전달된 메시지는 건너뜀 (apply_like_deltas)
     """
     def __init__(self):
-        self.group = "board_consumer_group"
-        self.consumer = "board_service"
-        self.streams = {
-            "post_stream": self.handle_post_event,
-            "comment_stream": self.handle_comment_event
-        }
-
-        for stream in self.streams.keys():
-            try:
-                r.xgroup_create(stream, self.group, id="0", mkstream=True)
-                print(f"📌 Redis Stream 그룹 생성 완료: {stream}")
-            except redis.exceptions.ResponseError:
-                print(f"📌 Redis Stream 그룹 이미 존재함: {stream}")
-
-    def start(self):
+        super().__init__("board_consumer_group", "board_service", {
+            "post_stream": self.handle_post_events,
+            "comment_stream": self.handle_comment_events,
+            "post_like_stream": self.handle_post_likes,
+            "comment_like_stream": self.handle_comment_likes
+        })
+
+    async def handle_post_events(self, events: List[dict], pipe):
+        """
+        ✅ 게시글 CRUD 이벤트 처리 → 읽기 캐시 무효화
+        - create: 목록 페이지
+        - update: 게시글 상세 + 목록 페이지
+        - delete: 게시글 상세 + 목록 페이지 + 함께 삭제된 댓글 작성자들의 댓글 목록
+        """
+        post_ids, user_ids, pages = set(), set(), False
+        for msg_data in events:
+            event_type = msg_data["event_type"]
+            if event_type in ("update", "delete"):
+                post_ids.add(int(msg_data["post_id"]))
+            if event_type == "delete":
+                user_ids.update(int(user_id) for user_id in msg_data.get("comment_author_ids", "").split(",") if user_id)
+            pages = pages or event_type in ("create", "update", "delete")
+
+        await invalidate(post_ids=post_ids, user_ids=user_ids, pages=pages, pipe=pipe)
+        print(f"📌 게시글 이벤트 {len(events)}건 처리 (게시글 상세 {len(post_ids)}개 무효화)")
+
+    async def handle_comment_events(self, events: List[dict], pipe):
         """
-        ✅ FastAPI1에서 게시글/댓글 이벤트를 처리하는 Stream 실행
+        ✅ 댓글 CRUD 이벤트 처리 → 읽기 캐시 무효화
+        - create / delete: comment_count가 바뀌므로 게시글 상세 + 목록 페이지 + 작성자 댓글 목록
+        - update: 작성자 댓글 목록
         """
-        for stream_name in self.streams.keys():
-            thread = threading.Thread(target=self.process_stream, args=(stream_name,))
-            thread.daemon = True
-            thread.start()
+        post_ids, user_ids, pages = set(), set(), False
+        for msg_data in events:
+            event_type = msg_data["event_type"]
+            if event_type in ("create", "update", "delete"):
+                user_ids.add(int(msg_data["author_id"]))
+            if event_type in ("create", "delete"):
+                post_ids.add(int(msg_data["post_id"]))
+                pages = True
+
+        await invalidate(post_ids=post_ids, user_ids=user_ids, pages=pages, pipe=pipe)
+        print(f"📌 댓글 이벤트 {len(events)}건 처리 (댓글 목록 {len(user_ids)}개 무효화)")
 
-    def process_stream(self, stream_name):
+    async def recover(self, stream_name: str, consumer: str, own_pending: bool = False) -> int:
+        recovered = await super().recover(stream_name, consumer, own_pending)
+        if stream_name in ("post_like_stream", "comment_like_stream"):
+            await self.prune_applied(stream_name)
+        return recovered
+
+    async def apply_like_deltas(self, stream_name: str, model, events: List[dict], id_field: str, *returning) -> list:
         """
-        ✅ 게시글 및 댓글 이벤트 처리
+        ✅ 항목별 like_count += delta (배치 전체를 UPDATE 한 번, CASE로 항목마다 다른 delta)
+        - 같은 트랜잭션에서 메시지 id를 INSERT ... ON CONFLICT DO NOTHING
+          → 처음 반영하는 메시지(RETURNING)의 delta만 더함 (반영 후 ACK 전에 실패해서 다시 전달된 메시지는 건너뜀)
+        - 다시 전달된 메시지의 항목도 현재 값을 읽어 반환
+          (DB 반영 후 순위 갱신 / 캐시 무효화 pipeline이 실패했던 경우 재처리 때 다시 실행되도록)
+        - 반환: 갱신 / 재처리된 행들의 returning 컬럼 값 튜플 (없는 항목은 제외)
         """
-        handler = self.streams[stream_name]
-        print(f"📌 Redis Stream 대기 중: {stream_name}")
+        async with SessionLocal() as db:
+            insert = postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+            applied = set((await db.execute(
+                insert(AppliedStreamMessage)
+                .values([
+                    dict(zip(("stream", "id_ms", "id_seq"), (stream_name, *parse_stream_id(msg_data["_id"]))))
+                    for msg_data in events
+                ])
+                .on_conflict_do_nothing()
+                .returning(AppliedStreamMessage.id_ms, AppliedStreamMessage.id_seq)
+            )).all())
+
+            deltas, replayed = Counter(), set()
+            for msg_data in events:
+                if parse_stream_id(msg_data["_id"]) in applied:
+                    deltas[int(msg_data[id_field])] += int(msg_data["delta"])
+                else:
+                    replayed.add(int(msg_data[id_field]))
+            deltas = {item_id: delta for item_id, delta in deltas.items() if delta}
 
-        while True:
-            try:
-                messages = r.xreadgroup(self.group, self.consumer, {stream_name: ">"}, count=1, block=1000)
-                for stream, msgs in messages:
-                    for msg_id, msg_data in msgs:
-                        handler(msg_data)
-                        r.xack(stream_name, self.group, msg_id)
+            values = []
+            if deltas:
+                values = (await db.execute(
+                    update(model)
+                    .where(model.id.in_(deltas))
+                    .values(like_count=model.like_count + case(deltas, value=model.id, else_=0))
+                    .returning(*returning)
+                    .execution_options(synchronize_session=False)
+                )).all()
+            if replayed:
+                values += (await db.execute(select(*returning).where(model.id.in_(replayed)))).all()
+            await db.commit()
+        return values
 
-            except Exception as e:
-                print(f"🚨 Redis Consumer Error ({stream_name}): {e}")
+    async def prune_applied(self, stream_name: str):
+        """
+        ✅ 다시 전달될 수 없는 메시지의 반영 기록 삭제 (recover 주기마다)
+        - 마지막으로 전달한 id 이하이면서 pending 중 가장 오래된 id보다 앞선 메시지는 이미 ACK됨
+        - 마지막 전달 id를 먼저 읽음 (이후 전달되는 메시지는 모두 이 id보다 큼)
+        """
+        group = next(info for info in await r.xinfo_groups(stream_name) if info["name"] == self.group)
+        summary = await r.xpending(stream_name, self.group)
 
-    def handle_post_event(self, msg_data):
+        key = tuple_(AppliedStreamMessage.id_ms, AppliedStreamMessage.id_seq)
+        conditions = [AppliedStreamMessage.stream == stream_name, key <= tuple_(*parse_stream_id(group["last-delivered-id"]))]
+        if summary["pending"]:
+            conditions.append(key < tuple_(*parse_stream_id(summary["min"])))
+        async with SessionLocal() as db:
+            await db.execute(delete(AppliedStreamMessage).where(*conditions))
+            await db.commit()
+
+    async def handle_post_likes(self, events: List[dict], pipe):
         """
-        ✅ 게시글 CRUD 이벤트 처리
+        ✅ 게시글 좋아요 이벤트 처리 → posts.like_count 갱신 + 좋아요 순위 갱신 + 게시글 상세 캐시 무효화
+        - 순위 점수는 갱신된 like_count 값으로 설정 (util/ranking.py update_scores)
+        - 목록 페이지 버전은 올리지 않음 (좋아요마다 모든 목록 페이지가 무효화되므로)
+          → 목록 응답의 like_count는 조회 시 순위 점수로 채움 (router/board_router.py with_like_counts)
         """
-        event_type = msg_data["event_type"]
-        post_id = msg_data["post_id"]
-
-        if event_type == "create":
-            print(f"📌 새로운 게시글 생성 이벤트 처리: {msg_data}")
-            r.setex(f"post_cache:{post_id}", 300, json.dumps(msg_data))
-        elif event_type == "update":
-            print(f"📌 게시글 수정 이벤트 처리: {msg_data}")
-            r.setex(f"post_cache:{post_id}", 300, json.dumps(msg_data))
-        elif event_type == "delete":
-            print(f"📌 게시글 삭제 이벤트 처리: {msg_data}")
-            r.delete(f"post_cache:{post_id}")
-
-    def handle_comment_event(self, msg_data):
+        like_counts = dict(await self.apply_like_deltas(
+            "post_like_stream", Post, events, "post_id", Post.id, Post.like_count,
+        ))
+        if like_counts:
+            await ranking.update_scores(like_counts, pipe=pipe)
+            await invalidate(post_ids=like_counts, pipe=pipe)
+        print(f"📌 게시글 좋아요 이벤트 {len(events)}건 처리 (like_count 갱신 {len(like_counts)}개)")
+
+    async def handle_comment_likes(self, events: List[dict], pipe):
         """
-        ✅ 댓글 CRUD 이벤트 처리
+        ✅ 댓글 좋아요 이벤트 처리 → comments.like_count 갱신 + 작성자 댓글 목록 캐시 무효화
         """
-        event_type = msg_data["event_type"]
-        comment_id = msg_data["comment_id"]
-
-        if event_type == "create":
-            print(f"📌 새로운 댓글 생성 이벤트 처리: {msg_data}")
-            r.setex(f"comment_cache:{comment_id}", 300, json.dumps(msg_data))
-        elif event_type == "update":
-            print(f"📌 댓글 수정 이벤트 처리: {msg_data}")
-            r.setex(f"comment_cache:{comment_id}", 300, json.dumps(msg_data))
-        elif event_type == "delete":
-            print(f"📌 댓글 삭제 이벤트 처리: {msg_data}")
-            r.delete(f"comment_cache:{comment_id}")
+        author_ids = {author_id for author_id, in await self.apply_like_deltas(
+            "comment_like_stream", Comment, events, "comment_id", Comment.author_id,
+        )}
+        if author_ids:
+            await invalidate(user_ids=author_ids, pipe=pipe)
+        print(f"📌 댓글 좋아요 이벤트 {len(events)}건 처리 (like_count 갱신 {len(author_ids)}개)")
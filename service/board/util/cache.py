@@ -0,0 +1,67 @@
+import json
+from typing import Iterable, Optional
+from util.redis_client import r
+from util.tiered_cache import TieredCache, CACHE_INVALIDATION_CHANNEL, drop_local
+
+# ✅ 읽기 캐시 키 / TTL (무효화는 BoardConsumer가 post_stream / comment_stream / 좋아요 이벤트로 처리)
+CACHE_EXPIRE_TIME_POST = 6 * 60 * 60  # ✅ 게시글 상세 (6시간)
+CACHE_EXPIRE_TIME_PAGE = 60 * 60  # ✅ 게시글 목록 페이지 (1시간)
+CACHE_EXPIRE_TIME_RANK_PAGE = 30  # ✅ 좋아요순 목록 페이지 (좋아요는 페이지 버전을 올리지 않으므로 순서는 TTL로 갱신)
+CACHE_STALE_TIME = 60  # ✅ 만료 후 이전 값을 반환하면서 백그라운드 갱신하는 시간
+
+# ✅ 목록 페이지 키는 cursor마다 달라 하나씩 지울 수 없으므로 버전을 올려 한 번에 무효화
+POSTS_VERSION_KEY = "posts:version"
+
+# ✅ L1(프로세스 내 LRU) + L2(Redis) 캐시
+post_cache = TieredCache("post", ttl=CACHE_EXPIRE_TIME_POST, stale_ttl=CACHE_STALE_TIME)
+page_cache = TieredCache("post_page", ttl=CACHE_EXPIRE_TIME_PAGE, stale_ttl=CACHE_STALE_TIME)
+rank_page_cache = TieredCache("post_rank_page", ttl=CACHE_EXPIRE_TIME_RANK_PAGE, stale_ttl=CACHE_EXPIRE_TIME_RANK_PAGE)
+# ✅ 목록 페이지 버전은 Redis 값 자체이므로 L1만 사용 (무효화 메시지로 제거, 메시지를 놓쳐도 l1_ttl 5초)
+version_cache = TieredCache("posts_version", ttl=CACHE_EXPIRE_TIME_PAGE, stale_ttl=0, l2=False)
+
+
+def post_key(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def user_comments_key(user_id: int) -> str:
+    """
+    ✅ 회원별 댓글 목록 (members 서비스 users/service.py가 읽고 캐싱하는 키)
+    """
+    return f"user_comments:{user_id}"
+
+
+async def get_posts_version() -> int:
+    async def load():
+        return int(await r.get(POSTS_VERSION_KEY) or 0)
+    return await version_cache.get_or_compute(POSTS_VERSION_KEY, load)
+
+
+async def post_page_key(cursor: Optional[str], limit: int, kind: str = "page") -> str:
+    version = await get_posts_version()
+    return f"posts:v{version}:{kind}:{cursor or 'first'}:{limit}"
+
+
+async def invalidate(post_ids: Iterable[int] = (), user_ids: Iterable[int] = (), pages: bool = False, pipe=None):
+    """
+    ✅ 게시글 상세 / 회원 댓글 목록 키 삭제 + (pages=True면) 목록 페이지 버전 증가를 pipeline 한 번으로 처리
+    - 각 board_service 프로세스의 L1도 지우도록 cache_invalidation 채널에 키 목록 발행
+    - pipe를 넘기면 명령만 쌓고 전송은 호출한 쪽에서 (Stream Consumer 배치의 XACK와 함께 전송)
+      → 전송 전에 지운 L1은 발행한 메시지를 이 프로세스도 받아 한 번 더 지움
+    """
+    keys = [post_key(post_id) for post_id in post_ids] + [user_comments_key(user_id) for user_id in user_ids]
+    local_keys = keys + [POSTS_VERSION_KEY] if pages else keys
+    if not local_keys:
+        return
+
+    execute = pipe is None
+    if execute:
+        pipe = r.pipeline(transaction=False)
+    if keys:
+        pipe.delete(*keys)
+    if pages:
+        pipe.incr(POSTS_VERSION_KEY)
+    pipe.publish(CACHE_INVALIDATION_CHANNEL, json.dumps(local_keys))
+    if execute:
+        await pipe.execute()
+    drop_local(local_keys)
@@ -0,0 +1,102 @@
+import os
+import time
+import asyncio
+import importlib.util
+import httpx
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "3"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "1"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))  # ✅ 요청당 최대 재시도 횟수
+HTTP_RETRY_BUDGET = float(os.getenv("HTTP_RETRY_BUDGET", "0.1"))  # ✅ 재시도는 최근 요청 수의 10%까지만
+# ✅ h2 패키지가 설치된 경우에만 HTTP/2 사용 가능
+HTTP2 = os.getenv("HTTP2", "0") == "1" and importlib.util.find_spec("h2") is not None
+
+
+class RetryBudget:
+    """
+    ✅ 재시도 예산 (token bucket)
+    - 요청마다 budget만큼 토큰 적립, 재시도할 때마다 1개 사용
+    - 하위 서비스 장애 시 재시도가 요청 수를 몇 배로 불리지 않도록 제한
+    """
+    def __init__(self, ratio: float = HTTP_RETRY_BUDGET, min_per_sec: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._last = time.monotonic()
+
+    def deposit(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio + (now - self._last) * self.min_per_sec)
+        self._last = now
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class HttpClient:
+    """
+    ✅ 서비스 간 호출용 공유 HTTP 클라이언트 (lifespan에서 start / stop)
+    - 커넥션 풀 + keep-alive 재사용 (요청마다 TCP 연결을 새로 맺지 않음)
+    - 연결 / 타임아웃 오류는 재시도 예산 안에서 지수 백오프로 재시도
+    """
+    def __init__(self, base_url: str, retries: int = HTTP_RETRIES):
+        self.base_url = base_url
+        self.retries = retries
+        self.budget = RetryBudget()
+        self._client = None
+
+    def _build(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=HTTP2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        )
+
+    async def start(self):
+        if self._client is None:
+            self._client = self._build()
+
+    async def stop(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = self._build()  # ✅ lifespan 밖(스크립트 등)에서 호출된 경우
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                response.raise_for_status()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = isinstance(e, httpx.TransportError) or e.response.status_code >= 500
+                if not retryable or attempt >= self.retries or not self.budget.withdraw():
+                    raise
+                attempt += 1
+                print(f"🚨 HTTP 요청 실패, 재시도 {attempt}/{self.retries}: {method} {url} ({e!r})")
+                await asyncio.sleep(0.05 * 2 ** (attempt - 1))
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
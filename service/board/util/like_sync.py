@@ -0,0 +1,70 @@
+"""
+✅ posts / comments.like_count 전체 동기화 (like_service 기준)
+
+- 카운터 컬럼을 처음 추가한 뒤 (migration 04eff8e405c4) 한 번 실행
+- 이벤트 유실 등으로 값이 어긋났을 때 다시 맞추는 용도로도 사용
+- 동기화 후 Redis 좋아요 순위(post_like_rank)도 다시 만듦
+
+    python -m util.like_sync [--batch-size 500]
+"""
+import asyncio
+import argparse
+from sqlalchemy import select, update, bindparam
+
+from model.database import SessionLocal, engine
+from model.models import Post, Comment
+from util.mapping import like_client
+from util import ranking
+
+BATCH_SIZE = 500  # ✅ like_service 일괄 조회 최대 ID 수 (dto/like.py LIKE_IDS_MAX)
+
+
+async def sync_like_counts(model, endpoint: str, batch_size: int = BATCH_SIZE) -> int:
+    """
+    ✅ id 순서대로 batch_size개씩 읽어 like_service 일괄 조회 API(/counts)로 개수를 받고 UPDATE
+    """
+    synced = 0
+    last_id = 0
+    async with SessionLocal() as db:
+        while True:
+            ids = (await db.scalars(
+                select(model.id).where(model.id > last_id).order_by(model.id).limit(batch_size)
+            )).all()
+            if not ids:
+                break
+
+            response = await like_client.post(f"/{endpoint}/counts", json={"ids": ids})
+            counts = {int(item_id): count for item_id, count in response.json().get("counts", {}).items()}
+
+            # ✅ executemany UPDATE 한 번
+            await db.execute(
+                update(model.__table__)
+                .where(model.__table__.c.id == bindparam("item_id"))
+                .values(like_count=bindparam("like_count")),
+                [{"item_id": item_id, "like_count": counts.get(item_id, 0)} for item_id in ids],
+            )
+            await db.commit()
+
+            synced += len(ids)
+            last_id = ids[-1]
+    return synced
+
+
+async def main(batch_size: int):
+    await like_client.start()
+    try:
+        posts = await sync_like_counts(Post, "board_like", batch_size)
+        print(f"✅ 게시글 {posts}개 like_count 동기화 완료")
+        comments = await sync_like_counts(Comment, "comment_like", batch_size)
+        print(f"✅ 댓글 {comments}개 like_count 동기화 완료")
+        async with SessionLocal() as db:
+            await ranking.rebuild(db)
+    finally:
+        await like_client.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help=f"최대 {BATCH_SIZE}")
+    asyncio.run(main(parser.parse_args().batch_size))
@@ -1,43 +1,52 @@
-import redis
 import httpx
 import json
+from typing import Dict, Iterable
+from util.http_client import HttpClient
+from util.redis_client import r
 
 
 LIKE_URI = "http://localhost:8002"
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
 
 CACHE_EXPIRE_TIME_LIKES = 300  # ✅ 5분 캐싱 (TTL 설정)
 
+like_client = HttpClient(LIKE_URI)  # ✅ like_service 호출용 공유 커넥션 풀 (main.py lifespan에서 관리)
 
-async def get_likes_count(item_id: int, item_type: str):
+
+async def get_likes_counts(item_ids: Iterable[int], item_type: str) -> Dict[int, int]:
     """
-    ✅ 좋아요 개수를 Redis에서 조회, 없으면 API 호출 후 캐싱
+    ✅ 여러 게시글 / 댓글의 좋아요 개수 일괄 조회
+    - 캐시된 값은 Redis MGET 한 번으로 조회
+    - 캐시에 없는 ID들만 like_service 일괄 조회 API(/counts)로 한 번에 요청 후 pipeline으로 캐싱
     """
     if item_type not in ["post", "comment"]:
         raise ValueError("Invalid item_type. Must be 'post' or 'comment'.")
 
-    cache_key = f"like_count:{item_type}:{item_id}"
+    item_ids = list(dict.fromkeys(item_ids))  # ✅ 순서 유지 중복 제거
+    if not item_ids:
+        return {}
+
+    # ✅ 1️⃣ Redis 캐시 확인 (MGET 한 번)
+    cached = await r.mget([f"like_count:{item_type}:{item_id}" for item_id in item_ids])
+    counts = {item_id: int(value) for item_id, value in zip(item_ids, cached) if value is not None}
 
-    # ✅ 1️⃣ Redis 캐시 확인
-    cached_likes = r.get(cache_key)
-    if cached_likes is not None:
-        return int(cached_likes)  # ✅ 캐시에 있으면 바로 반환
+    missing = [item_id for item_id in item_ids if item_id not in counts]
+    if not missing:
+        return counts
 
-    # ✅ 2️⃣ 캐시에 없으면 HTTP 요청 수행
+    # ✅ 2️⃣ 캐시에 없는 ID들만 HTTP 요청 한 번으로 조회
     endpoint = "board_like" if item_type == "post" else "comment_like"
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(f"{LIKE_URI}/{endpoint}/{item_type}/{item_id}/count")
-            response.raise_for_status()
-            like_count = response.json().get("like_count", 0)
-
-            # ✅ 3️⃣ Redis에 캐싱 (5분 TTL)
-            r.setex(cache_key, CACHE_EXPIRE_TIME_LIKES, like_count)
-            return like_count
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 404:
-                return 0  # ❗ 404일 경우 기본값 0 반환
-            raise
-        except httpx.RequestError:
-            return 0  # ❗ 요청 실패 시 기본값 0 반환
+    try:
+        response = await like_client.post(f"/{endpoint}/counts", json={"ids": missing})
+        fetched = {int(item_id): count for item_id, count in response.json().get("counts", {}).items()}
+    except (httpx.HTTPStatusError, httpx.RequestError, ValueError):
+        return {**counts, **dict.fromkeys(missing, 0)}  # ❗ 요청 실패 / JSON이 아닌 응답 시 기본값 0 반환
+
+    # ✅ 3️⃣ Redis에 캐싱 (5분 TTL, pipeline)
+    pipe = r.pipeline(transaction=False)
+    for item_id in missing:
+        counts[item_id] = fetched.get(item_id, 0)
+        pipe.setex(f"like_count:{item_type}:{item_id}", CACHE_EXPIRE_TIME_LIKES, counts[item_id])
+    await pipe.execute()
+
+    return counts
@@ -0,0 +1,51 @@
+import json
+import base64
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException
+
+PAGE_SIZE_DEFAULT = 20
+PAGE_SIZE_MAX = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SEARCH_OFFSET_MAX = 1000  # ✅ 검색 결과는 이 위치까지만 제공 (큰 offset은 일치하는 행 전체를 정렬함)
+CURSOR_INT_MAX = 2 ** 31 - 1  # ✅ cursor의 int 값 범위 (PostgreSQL integer, id / offset)
+
+
+def encode_cursor(*values) -> str:
+    """
+    ✅ 마지막 행의 정렬 키 → 불투명한 cursor 문자열 (URL-safe base64)
+    - datetime은 ISO 문자열로 저장
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    """
+    ✅ cursor 문자열 → 정렬 키 튜플 (types 순서대로 변환, 형식이 틀리면 400)
+    - int 자리는 integer 범위의 JSON 정수만 허용 (1.5 / 1e999 같은 실수는 거부), datetime 자리는 ISO 문자열만 허용
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError
+        values = []
+        for kind, value in zip(types, payload):
+            if kind is int and (type(value) is not int or abs(value) > CURSOR_INT_MAX):
+                raise ValueError
+            values.append(datetime.fromisoformat(value) if kind is datetime else kind(value))
+        return tuple(values)
+    except (ValueError, TypeError, OverflowError):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+
+
+def decode_offset(cursor: Optional[str], max_offset: Optional[int] = None) -> int:
+    """
+    ✅ offset cursor 문자열 → offset (cursor가 없으면 0, 음수이거나 max_offset보다 크면 decode_cursor와 같은 400)
+    """
+    if not cursor:
+        return 0
+    offset = decode_cursor(cursor, int)[0]
+    if offset < 0 or (max_offset is not None and offset > max_offset):
+        raise HTTPException(status_code=400, detail="잘못된 cursor 값입니다.")
+    return offset
@@ -0,0 +1,130 @@
+import uuid
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from model.models import Post
+from util.redis_client import r
+
+# ✅ 게시판 좋아요 순위 (sorted set, member = post_id, score = 좋아요 수)
+# - BoardConsumer가 posts.like_count 반영 후 그 값으로 갱신 (update_scores, 키가 없으면 만들지 않음)
+# - 키가 없으면 (Redis 재시작 등) 첫 조회 시 posts.like_count로 다시 만듦
+POST_LIKE_RANK_KEY = "post_like_rank"
+REBUILD_LOCK_KEY = f"{POST_LIKE_RANK_KEY}:rebuild_lock"
+REBUILD_DIRTY_KEY = f"{POST_LIKE_RANK_KEY}:dirty"  # ✅ 재구성 중 바뀐 게시글 (RENAME 후 다시 반영)
+REBUILD_LOCK_TTL = 300  # ✅ 재구성 잠금 (초, 한 곳에서만 재구성)
+REBUILD_CHUNK_SIZE = 1000
+RANK_OFFSET_MAX = 10000  # ✅ 좋아요순 페이지는 이 순위까지만 제공 (cursor offset 상한)
+
+# ✅ 순위 점수 갱신 (순위 키가 있을 때만 ZADD, 빈 점수는 ZREM) + 재구성 중이면 바뀐 게시글 기록
+# KEYS: 순위, 재구성 잠금, 재구성 중 바뀐 게시글 set / ARGV: post_id, 점수, post_id, 점수, ...
+UPDATE_SCRIPT = """
+local ranked = redis.call('EXISTS', KEYS[1]) == 1
+local rebuilding = redis.call('EXISTS', KEYS[2]) == 1
+for i = 1, #ARGV, 2 do
+    if ARGV[i + 1] == '' then
+        redis.call('ZREM', KEYS[1], ARGV[i])
+    elseif ranked then
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+    end
+    if rebuilding then
+        redis.call('SADD', KEYS[3], ARGV[i])
+    end
+end
+return #ARGV / 2
+"""
+_update_scores = r.register_script(UPDATE_SCRIPT)
+
+
+async def update_scores(scores: Dict[int, Optional[int]], pipe=None):
+    """
+    ✅ 게시글들의 순위 점수를 DB의 like_count 값으로 설정 (None이면 순위에서 제거)
+    - 증감(INCR)이 아닌 값으로 설정하므로 재처리 / 재구성과 겹쳐도 DB 값과 같아짐
+    - pipe를 넘기면 pipeline에 쌓기만 함
+    """
+    if not scores:
+        return
+    args = [value for post_id, score in scores.items() for value in (post_id, "" if score is None else score)]
+    await _update_scores(keys=[POST_LIKE_RANK_KEY, REBUILD_LOCK_KEY, REBUILD_DIRTY_KEY], args=args, client=pipe)
+
+
+async def add_post(post_id: int):
+    """
+    ✅ 새 게시글을 0점으로 순위에 추가 (순위가 아직 없으면 재구성 때 포함되므로 건너뜀)
+    """
+    await update_scores({post_id: 0})
+
+
+async def remove_post(post_id: int):
+    await update_scores({post_id: None})
+
+
+async def rebuild(db: AsyncSession) -> Optional[int]:
+    """
+    ✅ posts.like_count로 순위를 임시 키에 만든 뒤 RENAME (조회 중에 반쯤 채워진 순위가 보이지 않음)
+    - SET NX 잠금으로 한 곳에서만 재구성 (다른 곳에서 재구성 중이면 None)
+    - 재구성 중 바뀐 게시글(update_scores가 기록)은 RENAME 후 DB에서 다시 읽어 반영
+      (읽기 시작한 뒤 반영된 좋아요 / 새 글 / 삭제가 오래된 값으로 덮이지 않음)
+    """
+    token = uuid.uuid4().hex
+    if not await r.set(REBUILD_LOCK_KEY, token, nx=True, ex=REBUILD_LOCK_TTL):
+        print("📌 좋아요 순위 재구성 중 (건너뜀)")
+        return None
+    try:
+        tmp_key = f"{POST_LIKE_RANK_KEY}:rebuild"
+        await r.delete(tmp_key, REBUILD_DIRTY_KEY)
+
+        total = 0
+        rows = await db.stream(select(Post.id, Post.like_count).execution_options(yield_per=REBUILD_CHUNK_SIZE))
+        async for chunk in rows.partitions():
+            await r.zadd(tmp_key, {post_id: like_count for post_id, like_count in chunk})
+            total += len(chunk)
+
+        if total:
+            await r.rename(tmp_key, POST_LIKE_RANK_KEY)
+            dirty = [int(post_id) for post_id in await r.smembers(REBUILD_DIRTY_KEY)]
+            for i in range(0, len(dirty), REBUILD_CHUNK_SIZE):
+                post_ids = dirty[i:i + REBUILD_CHUNK_SIZE]
+                like_counts = dict((await db.execute(
+                    select(Post.id, Post.like_count).where(Post.id.in_(post_ids))
+                )).all())
+                pipe = r.pipeline(transaction=False)
+                for post_id in post_ids:
+                    if post_id in like_counts:
+                        pipe.zadd(POST_LIKE_RANK_KEY, {post_id: like_counts[post_id]})
+                    else:
+                        pipe.zrem(POST_LIKE_RANK_KEY, post_id)  # ✅ 재구성 중 삭제된 게시글
+                await pipe.execute()
+        print(f"📌 좋아요 순위 재구성 완료: 게시글 {total}개")
+        return total
+    finally:
+        if await r.get(REBUILD_LOCK_KEY) == token:
+            await r.delete(REBUILD_LOCK_KEY, REBUILD_DIRTY_KEY)
+
+
+async def fetch_scores(post_ids: List[int]) -> Dict[int, int]:
+    """
+    ✅ 게시글들의 현재 좋아요 수 (ZMSCORE 한 번, 순위에 없는 게시글은 제외)
+    """
+    if not post_ids:
+        return {}
+    scores = await r.zmscore(POST_LIKE_RANK_KEY, post_ids)
+    return {post_id: int(score) for post_id, score in zip(post_ids, scores) if score is not None}
+
+
+async def fetch_ranked_posts(db: AsyncSession, offset: int, count: int) -> List[Tuple[int, int]]:
+    """
+    ✅ 좋아요 순위 offset부터 count개 (post_id, 좋아요 수) 조회 (ZREVRANGE, O(log N + count))
+    - 순위 키가 없으면 재구성, 다른 요청이 재구성 중이면 DB에서 조회 (ix_posts_like_count_id)
+    """
+    if not await r.exists(POST_LIKE_RANK_KEY) and await rebuild(db) is None:
+        rows = await db.execute(
+            select(Post.id, Post.like_count)
+            .order_by(Post.like_count.desc(), Post.id.desc())
+            .offset(offset)
+            .limit(count)
+        )
+        return [(post_id, like_count) for post_id, like_count in rows]
+
+    ranked = await r.zrevrange(POST_LIKE_RANK_KEY, offset, offset + count - 1, withscores=True)
+    return [(int(post_id), int(score)) for post_id, score in ranked]
@@ -0,0 +1,213 @@
+import os
+import time
+import redis
+import socket
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+from util.redis_client import r
+
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "100"))  # ✅ XREADGROUP 한 번에 읽는 메시지 수
+STREAM_BLOCK_MS = int(os.getenv("STREAM_BLOCK_MS", "1000"))  # ✅ 새 메시지가 없을 때 대기 시간 (ms)
+STREAM_CONSUMERS = int(os.getenv("STREAM_CONSUMERS", "1"))  # ✅ 프로세스 하나가 stream마다 띄우는 consumer 수
+STREAM_STOP_TIMEOUT = 10  # ✅ 종료 시 처리 중인 배치를 기다리는 시간 (초, 넘으면 취소)
+STREAM_CLAIM_IDLE_MS = int(os.getenv("STREAM_CLAIM_IDLE_MS", "60000"))  # ✅ 이 시간 이상 ACK되지 않은 메시지는 회수
+STREAM_CLAIM_INTERVAL = float(os.getenv("STREAM_CLAIM_INTERVAL", "30"))  # ✅ pending 회수 주기 (초)
+STREAM_MAX_DELIVERIES = int(os.getenv("STREAM_MAX_DELIVERIES", "5"))  # ✅ 이 횟수를 넘게 전달된 메시지는 dead-letter로 이동
+DEAD_LETTER_MAXLEN = 10000  # ✅ dead-letter stream 최대 길이 (근사 trim)
+STREAM_CONSUMER_EXPIRE_MS = 60 * 60 * 1000  # ✅ pending 없이 이 시간 이상 읽지 않은 consumer 이름은 그룹에서 삭제 (재시작마다 이름이 바뀜)
+
+# ✅ 배치 handler: (메시지 데이터 목록 (메시지 id는 "_id"), pipeline) → Redis 쓰기는 pipeline에 쌓기만 함
+BatchHandler = Callable[[List[dict], "redis.asyncio.client.Pipeline"], Awaitable[None]]
+
+
+class StreamConsumer:
+    """
+    ✅ Redis Stream consumer group 배치 소비 (서비스별 Consumer가 상속해서 streams / handler 정의)
+    - stream마다 XREADGROUP으로 batch_size개씩 읽어 handler가 배치 전체를 한 번에 처리
+    - handler의 Redis 쓰기 + 처리한 메시지 전체 XACK를 pipeline 한 번으로 전송
+    - consumer 이름: <name>-<호스트>-<pid>-<번호> (uvicorn 워커 / 컨테이너 여러 개가 같은 그룹에서 나눠 처리)
+    - handler가 실패한 배치는 ACK하지 않음 (pending으로 남음)
+    - 종료는 취소 대신 플래그로: 처리 중인 배치는 끝까지 처리하고 ACK
+      (DB 반영 후 ACK 전에 취소되면 재전달된 배치가 한 번 더 반영됨)
+    - 📌 ACK 전에 실패한 메시지는 다시 전달되므로 DB에 쓰는 handler는 메시지 id("_id")로 중복 반영을 막아야 함
+    - pending 회수 (시작 시 + claim_interval마다, recover 참고):
+      ACK되지 않은 메시지를 다시 처리하고, max_deliveries번 넘게 실패한 메시지는 <stream>:dead_letter로 이동
+    """
+    def __init__(self, group: str, name: str, streams: Dict[str, BatchHandler],
+                 batch_size: int = STREAM_BATCH_SIZE, block_ms: int = STREAM_BLOCK_MS,
+                 consumers: int = STREAM_CONSUMERS, claim_idle_ms: int = STREAM_CLAIM_IDLE_MS,
+                 claim_interval: float = STREAM_CLAIM_INTERVAL, max_deliveries: int = STREAM_MAX_DELIVERIES):
+        self.group = group
+        self.streams = streams
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.consumers = consumers
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.max_deliveries = max_deliveries
+        self.consumer_prefix = f"{name}-{socket.gethostname()}-{os.getpid()}"
+        self._running = False
+        self._tasks = []
+
+    async def create_groups(self):
+        for stream in self.streams.keys():
+            try:
+                await r.xgroup_create(stream, self.group, id="0", mkstream=True)
+                print(f"📌 Redis Stream 그룹 생성 완료: {stream}")
+            except redis.exceptions.ResponseError:
+                print(f"📌 Redis Stream 그룹 이미 존재함: {stream}")
+
+    async def start(self):
+        """
+        ✅ stream마다 consumer task 실행 (이벤트 루프 task)
+        """
+        await self.create_groups()
+        self._running = True
+        for stream_name in self.streams.keys():
+            for i in range(self.consumers):
+                consumer = f"{self.consumer_prefix}-{i}"
+                self._tasks.append(asyncio.create_task(self.process_stream(stream_name, consumer)))
+
+    async def stop(self):
+        """
+        ✅ 새 배치를 읽지 않도록 하고 (XREADGROUP 대기는 최대 block_ms) 처리 중인 배치가 끝나길 기다림
+        """
+        self._running = False
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=self.block_ms / 1000 + STREAM_STOP_TIMEOUT)
+            for task in pending:
+                task.cancel()
+        self._tasks = []
+
+    @staticmethod
+    def dead_letter_stream(stream_name: str) -> str:
+        return f"{stream_name}:dead_letter"
+
+    async def process_stream(self, stream_name: str, consumer: str):
+        print(f"📌 Redis Stream 대기 중: {stream_name} ({consumer})")
+
+        last_claim = None
+        while self._running:
+            try:
+                if last_claim is None or time.monotonic() - last_claim >= self.claim_interval:
+                    await self.recover(stream_name, consumer, own_pending=last_claim is None)
+                    last_claim = time.monotonic()
+
+                messages = await r.xreadgroup(
+                    self.group, consumer, {stream_name: ">"},
+                    count=self.batch_size, block=self.block_ms,
+                )
+                for stream, msgs in messages:
+                    await self.handle_batch(stream_name, msgs)
+
+            except Exception as e:
+                print(f"🚨 Redis Consumer Error ({stream_name}): {e}")
+                await asyncio.sleep(1)
+
+    async def handle_batch(self, stream_name: str, msgs) -> int:
+        """
+        ✅ 배치 처리: handler(배치 전체) → handler의 Redis 쓰기 + XACK(id 전체)를 pipeline 한 번으로 전송
+        """
+        if not msgs:
+            return 0
+        pipe = r.pipeline(transaction=False)
+        await self.streams[stream_name]([{**msg_data, "_id": msg_id} for msg_id, msg_data in msgs], pipe)
+        pipe.xack(stream_name, self.group, *[msg_id for msg_id, _ in msgs])
+        await pipe.execute()
+        return len(msgs)
+
+    # ✅ pending 회수 / dead-letter
+    async def recover(self, stream_name: str, consumer: str, own_pending: bool = False) -> int:
+        """
+        ✅ ACK되지 않은 메시지 다시 처리 → 회수한 메시지 수
+        - own_pending (시작 시): 이 consumer 이름의 pending 전체 (같은 이름으로 재시작한 경우, 예: 컨테이너 hostname + pid)
+        - XAUTOCLAIM: claim_idle_ms 이상 ACK되지 않은 메시지 (죽은 consumer / 처리 실패한 배치)를 이 consumer로 가져옴
+        - pending이 없고 오래 읽지 않은 consumer 이름 삭제
+        """
+        recovered = 0
+        if own_pending:
+            start_id = "0"
+            while self._running:
+                messages = await r.xreadgroup(self.group, consumer, {stream_name: start_id}, count=self.batch_size)
+                msgs = messages[0][1] if messages else []
+                if not msgs:
+                    break
+                recovered += await self.retry_batch(stream_name, msgs)
+                start_id = msgs[-1][0]
+
+        start_id = "0-0"
+        while self._running:
+            result = await r.xautoclaim(
+                stream_name, self.group, consumer, self.claim_idle_ms,
+                start_id=start_id, count=self.batch_size,
+            )
+            start_id, msgs = result[0], result[1]
+            recovered += await self.retry_batch(stream_name, msgs)
+            if start_id == "0-0":
+                break
+
+        # ✅ 종료된 프로세스의 consumer 이름 정리 (pending은 위에서 회수됨, 살아 있는 consumer는 block_ms마다 읽음)
+        for info in await r.xinfo_consumers(stream_name, self.group):
+            if info["name"] != consumer and info["pending"] == 0 and info["idle"] > STREAM_CONSUMER_EXPIRE_MS:
+                await r.xgroup_delconsumer(stream_name, self.group, info["name"])
+
+        if recovered:
+            print(f"📌 pending 메시지 {recovered}건 회수 ({stream_name}, {consumer})")
+        return recovered
+
+    async def retry_batch(self, stream_name: str, msgs) -> int:
+        """
+        ✅ 회수한 메시지 처리
+        - 이미 삭제된 메시지 (데이터 없음)는 ACK만
+        - 전달 횟수(XPENDING)가 max_deliveries를 넘은 메시지는 dead-letter로 이동
+        - 나머지는 배치로 처리하고, 배치가 실패하면 메시지 하나씩 처리
+          (실패하는 메시지만 pending에 남아 전달 횟수가 쌓이고, 같은 배치의 정상 메시지는 ACK)
+        """
+        if not msgs:
+            return 0
+        deleted = [msg_id for msg_id, msg_data in msgs if not msg_data]
+        msgs = [(msg_id, msg_data) for msg_id, msg_data in msgs if msg_data]
+        if deleted:
+            await r.xack(stream_name, self.group, *deleted)
+        if not msgs:
+            return len(deleted)
+
+        pipe = r.pipeline(transaction=False)
+        for msg_id, _ in msgs:
+            pipe.xpending_range(stream_name, self.group, min=msg_id, max=msg_id, count=1)
+        deliveries = {
+            pending[0]["message_id"]: pending[0]["times_delivered"]
+            for pending in await pipe.execute() if pending
+        }
+
+        dead = [(msg_id, msg_data) for msg_id, msg_data in msgs if deliveries.get(msg_id, 0) > self.max_deliveries]
+        alive = [(msg_id, msg_data) for msg_id, msg_data in msgs if deliveries.get(msg_id, 0) <= self.max_deliveries]
+        if dead:
+            await self.dead_letter(stream_name, dead, deliveries)
+
+        try:
+            await self.handle_batch(stream_name, alive)
+        except Exception as e:
+            print(f"🚨 회수한 배치 처리 실패, 메시지별로 재시도 ({stream_name}): {e}")
+            for msg in alive:
+                try:
+                    await self.handle_batch(stream_name, [msg])
+                except Exception as e:
+                    print(f"🚨 메시지 처리 실패 ({stream_name} {msg[0]}, 전달 {deliveries.get(msg[0], 0)}회): {e}")
+        return len(deleted) + len(msgs)
+
+    async def dead_letter(self, stream_name: str, msgs, deliveries: Dict[str, int]):
+        """
+        ✅ 처리할 수 없는 메시지를 <stream>:dead_letter에 원본 그대로 (+ 원래 id / 그룹 / 전달 횟수) 추가하고 ACK
+        - pending에서 빠지므로 PEL이 계속 커지지 않음, 원인 확인 후 필요하면 원래 stream에 다시 XADD
+        """
+        pipe = r.pipeline(transaction=True)
+        for msg_id, msg_data in msgs:
+            pipe.xadd(
+                self.dead_letter_stream(stream_name),
+                {**msg_data, "_id": msg_id, "_group": self.group, "_deliveries": deliveries.get(msg_id, 0)},
+                maxlen=DEAD_LETTER_MAXLEN, approximate=True,
+            )
+        pipe.xack(stream_name, self.group, *[msg_id for msg_id, _ in msgs])
+        await pipe.execute()
+        print(f"🚨 dead-letter로 이동 ({stream_name}): {[msg_id for msg_id, _ in msgs]}")
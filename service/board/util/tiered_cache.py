@@ -0,0 +1,234 @@
+import json
+import math
+import time
+import random
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, NamedTuple, Optional, Set
+
+import redis
+from util.redis_client import r
+
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"  # ✅ L1 무효화 브로드캐스트 (프로세스 / 워커마다 L1이 따로 있음)
+
+caches: Dict[str, "TieredCache"] = {}  # ✅ 이름 → 캐시 (통계 조회 / 무효화 메시지 전달용)
+
+
+class Entry(NamedTuple):
+    value: Any
+    expires_at: float  # ✅ 이 시각 이후는 stale (백그라운드 갱신하면서 stale 값 반환)
+    stale_until: float  # ✅ 이 시각 이후는 사용 불가 (동기 재계산)
+    delta: float  # ✅ 마지막 계산에 걸린 시간 (초, 확률적 조기 갱신에 사용)
+
+
+class TieredCache:
+    """
+    ✅ 2단계 캐시: 프로세스 내 LRU(L1) → Redis(L2) → compute
+    - single-flight: 같은 키를 동시에 계산하지 않음 (한 번 계산하고 대기 중인 요청이 결과를 공유)
+    - 확률적 조기 갱신 (XFetch): 만료가 가까울수록, 계산이 오래 걸릴수록 미리 백그라운드 갱신
+    - stale-while-revalidate: 만료 후 stale_ttl 동안은 이전 값을 바로 반환하고 백그라운드에서 갱신
+    - L1은 l1_ttl만 유지 (다른 프로세스의 무효화 메시지를 놓쳐도 최대 l1_ttl초만 오래된 값)
+    - compute는 요청 밖(백그라운드)에서도 실행되므로 요청의 DB 세션 대신 자체 세션을 사용해야 함
+    """
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 60, l1_ttl: float = 5,
+                 l1_maxsize: int = 1024, l2: bool = True, beta: float = 1.0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.l1_ttl = l1_ttl
+        self.l1_maxsize = l1_maxsize
+        self.l2 = l2
+        self.beta = beta
+
+        self._l1: "OrderedDict[str, tuple[Entry, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._discard: Set[asyncio.Task] = set()  # ✅ 계산 도중 무효화된 task (결과를 저장하지 않음)
+        self.stats = dict.fromkeys(["l1_hits", "l2_hits", "misses", "coalesced", "stale_hits", "early_refreshes", "errors"], 0)
+        caches[name] = self
+
+    # ✅ L1 (bounded LRU)
+    def _l1_get(self, key: str, now: float) -> Optional[Entry]:
+        item = self._l1.get(key)
+        if item is None:
+            return None
+        entry, l1_expires_at = item
+        if now >= l1_expires_at or now >= entry.stale_until:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return entry
+
+    def _l1_set(self, key: str, entry: Entry, now: float):
+        self._l1[key] = (entry, now + self.l1_ttl)
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_maxsize:
+            self._l1.popitem(last=False)
+
+    def drop_local(self, keys: Iterable[str]):
+        """
+        ✅ L1에서 키 제거 (무효화 메시지 수신 시)
+        - 그 키를 계산 중인 task는 무효화 전 데이터를 읽었을 수 있으므로 결과를 저장하지 않게 하고,
+          이후 요청은 새로 계산
+        """
+        for key in keys:
+            self._l1.pop(key, None)
+            task = self._inflight.pop(key, None)
+            if task is not None:
+                self._discard.add(task)
+
+    def clear_local(self):
+        self._l1.clear()
+        self._discard.update(self._inflight.values())
+        self._inflight.clear()
+
+    # ✅ 조회
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        now = time.time()
+        entry = self._l1_get(key, now)
+        if entry is not None:
+            self.stats["l1_hits"] += 1
+        elif self.l2:
+            entry = self._decode(await r.get(key))
+            if entry is not None and now < entry.stale_until:
+                self.stats["l2_hits"] += 1
+                self._l1_set(key, entry, now)
+            else:
+                entry = None
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return await self._load(key, compute)
+
+        if now >= entry.expires_at:
+            self.stats["stale_hits"] += 1
+            self._refresh(key, compute)
+        elif now - entry.delta * self.beta * math.log(1.0 - random.random()) >= entry.expires_at:
+            self.stats["early_refreshes"] += 1
+            self._refresh(key, compute)
+        return entry.value
+
+    def cached(self, key: Callable[..., str]):
+        """
+        ✅ 데코레이터: key(*args, **kwargs)로 캐시 키를 만들고 함수 결과를 캐싱 (None은 캐싱하지 않음)
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await self.get_or_compute(key(*args, **kwargs), lambda: func(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    # ✅ 계산 (single-flight)
+    async def _load(self, key: str, compute):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute_and_store(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+        else:
+            self.stats["coalesced"] += 1  # ✅ 이미 계산 중인 키 → 같은 결과를 기다림 (DB 조회 없음)
+        # ✅ 기다리던 요청 하나가 취소돼도 다른 요청이 공유하는 계산은 계속 진행
+        return await asyncio.shield(task)
+
+    def _refresh(self, key: str, compute):
+        if key not in self._inflight:
+            task = asyncio.create_task(self._compute_and_store(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._done, key))
+
+    def _done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        self._discard.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+            print(f"🚨 캐시 계산 실패 ({self.name}:{key}): {task.exception()!r}")
+
+    async def _compute_and_store(self, key: str, compute):
+        start = time.monotonic()
+        value = await compute()
+        delta = time.monotonic() - start
+
+        if value is None or asyncio.current_task() in self._discard:
+            return value  # ✅ 계산 중 무효화됨 → 오래된 값일 수 있으므로 저장하지 않음
+
+        now = time.time()
+        entry = Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl, delta)
+        self._l1_set(key, entry, now)
+        if self.l2:
+            payload = json.dumps({"v": value, "exp": entry.expires_at, "delta": delta})
+            await r.set(key, payload, ex=math.ceil(self.ttl + self.stale_ttl))
+        return value
+
+    def _decode(self, raw: Optional[str]) -> Optional[Entry]:
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            return Entry(data["v"], data["exp"], data["exp"] + self.stale_ttl, data["delta"])
+        except (ValueError, TypeError, KeyError):
+            return None  # ✅ 다른 형식으로 저장된 값 (배포 직후 이전 버전 캐시 등)
+
+    def snapshot(self) -> dict:
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "l1_size": len(self._l1),
+            "hit_ratio": round(hits / total, 4) if total else None,
+            "l1_hit_ratio": round(self.stats["l1_hits"] / total, 4) if total else None,
+        }
+
+
+def drop_local(keys: Iterable[str]):
+    keys = list(keys)
+    for cache in caches.values():
+        cache.drop_local(keys)
+
+
+def cache_stats() -> dict:
+    return {name: cache.snapshot() for name, cache in caches.items()}
+
+
+class InvalidationListener:
+    """
+    ✅ cache_invalidation 채널을 구독하고 받은 키를 모든 캐시의 L1에서 제거 (lifespan에서 start / stop)
+    """
+    def __init__(self):
+        self._pubsub = None
+        self._task = None
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._pubsub = r.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    drop_local(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except (redis.exceptions.RedisError, ValueError) as e:
+                print(f"🚨 캐시 무효화 구독 오류: {e}")
+                # ✅ 구독이 끊긴 동안의 무효화 메시지는 알 수 없으므로 L1 전체 비움
+                for cache in caches.values():
+                    cache.clear_local()
+                await asyncio.sleep(1)
+
+
+invalidation_listener = InvalidationListener()
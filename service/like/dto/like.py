@@ -1,8 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+LIKE_IDS_MAX = 500  # ✅ 일괄 조회 한 번에 요청할 수 있는 최대 ID 수
 
 class LikeResponse(BaseModel):
     message: str
     like_count: int
+    liked: Optional[bool] = None  # ✅ 현재 회원의 좋아요 여부 (상태 조회 / 토글 응답)
 
 class LikeCount(BaseModel):
     post_id: int
@@ -10,3 +14,16 @@ class LikeCount(BaseModel):
 
     class Config:
         from_attributes = True  # ✅ ORM에서 변환 가능하도록 설정
+
+class LikeCountsRequest(BaseModel):
+    ids: List[int] = Field(..., max_length=LIKE_IDS_MAX)  # ✅ 좋아요 개수를 조회할 게시글 / 댓글 ID 목록
+
+class LikeCountsResponse(BaseModel):
+    counts: Dict[int, int]  # ✅ {ID: 좋아요 개수} (좋아요가 없으면 0)
+
+class LikeStatus(BaseModel):
+    liked: bool  # ✅ 현재 회원의 좋아요 여부
+    like_count: int
+
+class LikeStatusesResponse(BaseModel):
+    statuses: Dict[int, LikeStatus]  # ✅ {ID: 좋아요 여부 / 개수} (요청한 ID 모두 포함)
@@ -1,10 +1,26 @@
 from fastapi import FastAPI
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from router.board_like_router import board_like_router
 from router.comment_like_router import comment_like_router
+from util.auth import auth_client
+from util.redis_client import close_redis
+from util.like_store import like_flusher
 
-app = FastAPI()
+# ✅ Lifespan 이벤트 핸들러 정의
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("🚀 [like_service] FastAPI 서버 시작: 인증 응답 구독 시작")
+    await auth_client.start()
+    await like_flusher.start()  # ✅ Redis 좋아요 토글을 주기적으로 DB에 반영
+    yield
+    await like_flusher.stop()  # ✅ 남은 토글 반영 후 종료
+    await auth_client.stop()
+    await close_redis()  # ✅ 공유 Redis 커넥션 풀 정리
+    print("❌ [like_service] FastAPI 서버 종료")
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
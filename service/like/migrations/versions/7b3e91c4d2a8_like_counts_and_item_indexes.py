@@ -0,0 +1,52 @@
+"""like counts and item indexes
+
+Revision ID: 7b3e91c4d2a8
+Revises: 05684288b178
+Create Date: 2026-10-18 12:00:00.000000
+
+post_like_counts / comment_like_counts는 기존 좋아요 행을 GROUP BY로 집계해서 채움
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e91c4d2a8'
+down_revision: Union[str, None] = '05684288b178'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_post_likes_post_id'), 'post_likes', ['post_id'], unique=False)
+    op.create_index(op.f('ix_comment_likes_comment_id'), 'comment_likes', ['comment_id'], unique=False)
+
+    op.create_table('post_like_counts',
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('like_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.create_table('comment_like_counts',
+    sa.Column('comment_id', sa.Integer(), nullable=False),
+    sa.Column('like_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('comment_id')
+    )
+
+    # ✅ 기존 좋아요 개수 반영
+    op.execute(
+        "INSERT INTO post_like_counts (post_id, like_count) "
+        "SELECT post_id, COUNT(*) FROM post_likes GROUP BY post_id"
+    )
+    op.execute(
+        "INSERT INTO comment_like_counts (comment_id, like_count) "
+        "SELECT comment_id, COUNT(*) FROM comment_likes GROUP BY comment_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('comment_like_counts')
+    op.drop_table('post_like_counts')
+    op.drop_index(op.f('ix_comment_likes_comment_id'), table_name='comment_likes')
+    op.drop_index(op.f('ix_post_likes_post_id'), table_name='post_likes')
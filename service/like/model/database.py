@@ -1,20 +1,23 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 from .settings import settings  # ✅ settings에서 database_url 가져오기
 
-# ✅ Database engine 설정
-engine = create_engine(settings.database_url)
+# ✅ 비동기 Database engine 설정 (asyncpg, 커넥션 풀)
+pool_options = {} if settings.async_database_url.startswith("sqlite") else {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+}
+engine = create_async_engine(settings.async_database_url, pool_pre_ping=settings.db_pool_pre_ping, **pool_options)
 
-# ✅ Database session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# ✅ Database session (commit 후에도 객체 속성을 다시 조회하지 않도록 expire_on_commit=False)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # ✅ SQLAlchemy Base
 Base = declarative_base()
 
 # ✅ FastAPI의 Depends에서 사용할 DB 세션 함수
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db  # ✅ db 세션을 FastAPI의 Depends로 사용
-    finally:
-        db.close()  # ✅ 사용 후 세션 종료
+async def get_db():
+    async with SessionLocal() as db:
+        yield db  # ✅ db 세션을 FastAPI의 Depends로 사용 (종료 시 자동 close)
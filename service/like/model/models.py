@@ -5,7 +5,7 @@ class PostLike(Base):
     __tablename__ = "post_likes"
 
     id = Column(Integer, primary_key=True, index=True)
-    post_id = Column(Integer, nullable=False)  # ✅ 게시글 ID (board_service에서 제공)
+    post_id = Column(Integer, nullable=False, index=True)  # ✅ 게시글 ID (board_service에서 제공)
     user_id = Column(Integer, nullable=False)  # ✅ Django의 회원 ID
 
     __table_args__ = (UniqueConstraint("post_id", "user_id", name="unique_post_like"),)
@@ -14,7 +14,25 @@ class CommentLike(Base):
     __tablename__ = "comment_likes"
 
     id = Column(Integer, primary_key=True, index=True)
-    comment_id = Column(Integer, nullable=False)  # ✅ 댓글 ID (board_service에서 제공)
+    comment_id = Column(Integer, nullable=False, index=True)  # ✅ 댓글 ID (board_service에서 제공)
     user_id = Column(Integer, nullable=False)  # ✅ Django의 회원 ID
 
     __table_args__ = (UniqueConstraint("comment_id", "user_id", name="unique_comment_like"),)
+
+class PostLikeCount(Base):
+    """
+    ✅ 게시글별 좋아요 개수 (토글 / DB 반영과 같은 트랜잭션에서 갱신, COUNT(*) 대신 조회)
+    """
+    __tablename__ = "post_like_counts"
+
+    post_id = Column(Integer, primary_key=True)
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+class CommentLikeCount(Base):
+    """
+    ✅ 댓글별 좋아요 개수
+    """
+    __tablename__ = "comment_like_counts"
+
+    comment_id = Column(Integer, primary_key=True)
+    like_count = Column(Integer, nullable=False, default=0, server_default="0")
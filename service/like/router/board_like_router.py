@@ -1,10 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from model.database import get_db
+from fastapi import APIRouter, Header
 
-from dto.like import LikeResponse, LikeCount
+from dto.like import LikeResponse, LikeCount, LikeCountsRequest, LikeCountsResponse, LikeStatusesResponse
 from util.auth import get_user_info
-from model.models import PostLike, CommentLike
+from util.like_store import post_likes
+from util.redis_client import r
 
 board_like_router = APIRouter(
     prefix="/board_like",
@@ -16,70 +15,76 @@ board_like_router = APIRouter(
 async def toggle_like_post(
         post_id: int,
         authorization: str = Header(...),
-        db: Session = Depends(get_db)
 ):
     """
     ✅ 게시글 좋아요 토글 API
     - 좋아요가 눌려있으면 취소
     - 좋아요가 없으면 추가
+    - LIKE_STORE=redis: Redis Lua 스크립트 한 번으로 토글 + 개수 갱신 (DB 반영은 LikeFlusher가 모아서 처리)
+    - LIKE_STORE=db: INSERT / DELETE ... RETURNING + 개수 테이블 갱신을 DB 문장 한 번으로 처리
     """
 
     # ✅ JWT 토큰에서 유저 정보 가져오기
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     user_id = user_info['id']
 
-    # ✅ 현재 좋아요 여부 확인
-    existing_like = db.query(PostLike).filter(
-        PostLike.post_id == post_id,
-        PostLike.user_id == user_id
-    ).first()
-
-    if existing_like:
-        # ✅ 좋아요 취소
-        db.delete(existing_like)
-        db.commit()
-        action = "취소됨"
-    else:
-        # ✅ 좋아요 추가
-        new_like = PostLike(post_id=post_id, user_id=user_id)
-        db.add(new_like)
-        db.commit()
-        action = "추가됨"
-
-    # ✅ 업데이트된 좋아요 개수 반환
-    like_count = db.query(PostLike).filter(PostLike.post_id == post_id).count()
+    liked, like_count, delta = await post_likes.toggle(post_id, user_id)
+    action = "추가됨" if liked else "취소됨"
+
+    # ✅ Redis Stream에 좋아요 이벤트 추가 (실제로 바뀐 개수가 없으면 생략)
+    # - board_service가 posts.like_count에 delta 반영 후 좋아요 순위도 갱신
+    if delta:
+        await r.xadd("post_like_stream", {"post_id": post_id, "user_id": user_id, "delta": delta, "like_count": like_count})
 
     return LikeResponse(
         message=f"게시글 좋아요 {action}.",
-        like_count=like_count
+        like_count=like_count,
+        liked=liked,
     )
 
 
-@board_like_router.get("/post/{post_id}/count")
-async def get_like_count(post_id: int, db: Session = Depends(get_db), response_model=LikeCount):
+@board_like_router.get("/post/{post_id}/count", response_model=LikeCount)
+async def get_like_count(post_id: int):
+    """
+    특정 게시글의 좋아요 개수 조회 (Redis 또는 개수 테이블)
+    """
+    counts = await post_likes.counts([post_id])
+    return {"post_id": post_id, "like_count": counts[post_id]}
+
+
+@board_like_router.post("/counts", response_model=LikeCountsResponse)
+async def get_like_counts(request: LikeCountsRequest):
     """
-    특정 게시글의 좋아요 개수 조회
+    ✅ 여러 게시글의 좋아요 개수 일괄 조회 (Redis MGET 한 번 또는 개수 테이블 조회 한 번)
     """
-    like_count = db.query(PostLike).filter(PostLike.post_id == post_id).count()
-    return {"post_id": post_id, "like_count": like_count}
+    return {"counts": await post_likes.counts(request.ids)}
 
 
 @board_like_router.get("/post/{post_id}/status", response_model=LikeResponse)
 async def get_like_status(
         post_id: int,
         authorization: str = Header(...),
-        db: Session = Depends(get_db)
 ):
     """ 현재 유저가 좋아요를 눌렀는지 확인 """
-    user_info = get_user_info(authorization)
+    user_info = await get_user_info(authorization)
     user_id = user_info['id']
 
-    existing_like = db.query(PostLike).filter(
-        PostLike.post_id == post_id,
-        PostLike.user_id == user_id
-    ).first()
+    liked, like_count = await post_likes.status(post_id, user_id)
 
-    liked = bool(existing_like)
-    like_count = db.query(PostLike).filter(PostLike.post_id == post_id).count()
+    return LikeResponse(message="좋아요 상태 조회", like_count=like_count, liked=liked)
 
-    return LikeResponse(message="좋아요 상태 조회", like_count=like_count, liked=liked)
\ No newline at end of file
+
+@board_like_router.post("/statuses", response_model=LikeStatusesResponse)
+async def get_like_statuses(
+        request: LikeCountsRequest,
+        authorization: str = Header(...),
+):
+    """
+    ✅ 여러 게시글의 현재 유저 좋아요 여부 + 개수 일괄 조회 (목록 페이지 한 번에 요청 한 번)
+    - 인증 한 번 + Redis pipeline 한 번 (LIKE_STORE=db면 쿼리 한 번)
+    """
+    user_info = await get_user_info(authorization)
+    statuses = await post_likes.statuses(request.ids, user_info['id'])
+    return {"statuses": {
+        post_id: {"liked": liked, "like_count": like_count} for post_id, (liked, like_count) in statuses.items()
+    }}
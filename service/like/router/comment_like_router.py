@@ -1,12 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
-from model.database import get_db
+from fastapi import APIRouter, Header
 
-import redis
-
-from dto.like import LikeResponse, LikeCount
+from dto.like import LikeResponse, LikeCountsRequest, LikeCountsResponse, LikeStatusesResponse
 from util.auth import get_user_info
-from model.models import PostLike, CommentLike
+from util.like_store import comment_likes
+from util.redis_client import r
 
 comment_like_router = APIRouter(
     prefix="/comment_like",
@@ -15,7 +12,6 @@ comment_like_router = APIRouter(
 )
 
 
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
 CACHE_EXPIRE_TIME = 300  # ✅ 5분 TTL
 
 # ✅ 댓글 좋아요 토글 API
@@ -23,54 +19,57 @@ CACHE_EXPIRE_TIME = 300  # ✅ 5분 TTL
 async def toggle_like_comment(
         comment_id: int,
         authorization: str = Header(...),
-        db: Session = Depends(get_db)
 ):
     """
-    ✅ 댓글 좋아요 토글 (인증 + Redis Stream 사용)
+    ✅ 댓글 좋아요 토글 (인증 + LIKE_STORE 토글 한 번 + Redis Stream 사용)
     """
     user_info = await get_user_info(authorization)
     user_id = user_info["id"]
 
-    existing_like = db.query(CommentLike).filter(
-        CommentLike.comment_id == comment_id,
-        CommentLike.user_id == user_id
-    ).first()
-
-    if existing_like:
-        # ✅ 좋아요 취소
-        db.delete(existing_like)
-        db.commit()
-        message = "댓글 좋아요가 취소되었습니다."
-    else:
-        # ✅ 좋아요 추가
-        new_like = CommentLike(comment_id=comment_id, user_id=user_id)
-        db.add(new_like)
-        db.commit()
+    liked, new_like_count, delta = await comment_likes.toggle(comment_id, user_id)
+    if liked:
         message = "댓글에 좋아요가 추가되었습니다."
+    else:
+        message = "댓글 좋아요가 취소되었습니다."
 
-    # ✅ Redis 캐시 업데이트
-    like_cache_key = f"like_count:comment:{comment_id}"
-    new_like_count = db.query(CommentLike).filter(CommentLike.comment_id == comment_id).count()
-    r.setex(like_cache_key, CACHE_EXPIRE_TIME, new_like_count)
+    # ✅ board_service가 읽는 좋아요 개수 캐시 갱신 + Redis Stream에 좋아요 이벤트 추가
+    # (board_service가 comments.like_count에 delta 반영, 실제로 바뀐 개수가 없으면 이벤트 생략)
+    pipe = r.pipeline(transaction=False)
+    pipe.setex(f"like_count:comment:{comment_id}", CACHE_EXPIRE_TIME, new_like_count)
+    if delta:
+        pipe.xadd("comment_like_stream", {"comment_id": comment_id, "user_id": user_id, "delta": delta, "like_count": new_like_count})
+    await pipe.execute()
 
-    return LikeResponse(message=message, like_count=new_like_count)
+    return LikeResponse(message=message, like_count=new_like_count, liked=liked)
 
 
 @comment_like_router.get("/comment/{comment_id}/count", response_model=LikeResponse)
-async def get_comment_like_count(comment_id: int, db: Session = Depends(get_db)):
+async def get_comment_like_count(comment_id: int):
     """
-    ✅ 댓글 좋아요 개수 조회 (Redis 캐싱 적용)
+    ✅ 댓글 좋아요 개수 조회 (Redis 또는 개수 테이블)
     """
-    like_cache_key = f"like_count:comment:{comment_id}"
-    cached_count = r.get(like_cache_key)
+    counts = await comment_likes.counts([comment_id])
+    return LikeResponse(message="댓글 좋아요 개수 조회 성공", like_count=counts[comment_id])
 
-    if cached_count is not None:
-        print(f"📌 Redis 캐시에서 댓글 {comment_id} 좋아요 개수 조회")
-        return LikeResponse(message="댓글 좋아요 개수 조회 성공 (캐싱)", like_count=int(cached_count))
 
-    # ✅ Redis에 없으면 DB 조회 후 캐싱
-    like_count = db.query(CommentLike).filter(CommentLike.comment_id == comment_id).count()
-    r.setex(like_cache_key, CACHE_EXPIRE_TIME, like_count)  # ✅ 5분 TTL 설정
+@comment_like_router.post("/counts", response_model=LikeCountsResponse)
+async def get_comment_like_counts(request: LikeCountsRequest):
+    """
+    ✅ 여러 댓글의 좋아요 개수 일괄 조회 (Redis MGET 한 번 또는 개수 테이블 조회 한 번)
+    """
+    return {"counts": await comment_likes.counts(request.ids)}
 
-    return LikeResponse(message="댓글 좋아요 개수 조회 성공", like_count=like_count)
 
+@comment_like_router.post("/statuses", response_model=LikeStatusesResponse)
+async def get_comment_like_statuses(
+        request: LikeCountsRequest,
+        authorization: str = Header(...),
+):
+    """
+    ✅ 여러 댓글의 현재 유저 좋아요 여부 + 개수 일괄 조회 (인증 한 번 + Redis pipeline / 쿼리 한 번)
+    """
+    user_info = await get_user_info(authorization)
+    statuses = await comment_likes.statuses(request.ids, user_info["id"])
+    return {"statuses": {
+        comment_id: {"liked": liked, "like_count": like_count} for comment_id, (liked, like_count) in statuses.items()
+    }}
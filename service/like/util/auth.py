@@ -1,51 +1,125 @@
-import redis
+import os
+import asyncio
 import json
 import uuid
-import time
 from fastapi import HTTPException
+from util.redis_client import r
+from util.jwt_verifier import InvalidToken, VerifiedTokenCache, decode_access_token
 
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
+AUTH_REQUEST_STREAM = "auth_request_stream"
+AUTH_RESPONSE_PREFIX = "auth_response_"
+AUTH_TIMEOUT = 5  # ✅ 응답 대기 시간 (초)
+AUTH_LOCAL_VERIFY = os.getenv("AUTH_LOCAL_VERIFY", "1") == "1"  # ✅ 0이면 매 요청 Django 왕복 (기존 방식)
 
-def get_user_info(authorization: str):
-    if not authorization.startswith("Bearer "):
-        print(f"🚨 잘못된 Authorization 형식: {authorization}")
-        raise HTTPException(status_code=401, detail="잘못된 토큰 형식: Bearer 필요")
 
-    token = authorization.split("Bearer ")[1]
-    request_id = str(uuid.uuid4())
+class AuthClient:
+    """
+    ✅ redis.asyncio 기반 비동기 인증 클라이언트 (서비스 공유 커넥션 풀 사용)
+    - `auth_response_*` 패턴 구독 하나를 공유하고, 응답을 request_id별 future로 분배
+    - 요청마다 pubsub 연결을 새로 만들거나 이벤트 루프를 막지 않음
+    - 토큰 서명 / 만료는 로컬에서 검증하고, Django 왕복은 jti 캐시 미스일 때만 (username 조회 + 회원 존재 확인)
+    """
+    def __init__(self):
+        self.redis = r
+        self._pending: dict[str, asyncio.Future] = {}
+        self.token_cache = VerifiedTokenCache()
+        self._pubsub = None
+        self._listener = None
 
-    request_data = {
-        "request_id": request_id,
-        "access_token": token
-    }
+    async def start(self):
+        await self._subscribe()
+        self._listener = asyncio.create_task(self._listen())
 
-    print(f"📌 Redis Stream 인증 요청 추가: {request_data}")
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
 
-    # ✅ Redis Stream에 요청 추가
-    r.xadd("auth_request_stream", request_data)
-    print(f"📌 Redis Stream 추가 완료!")
+    async def _subscribe(self):
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.psubscribe(f"{AUTH_RESPONSE_PREFIX}*")
 
-    # ✅ Redis Pub/Sub 구독하여 응답 기다림 (타임아웃 5초 설정)
-    pubsub = r.pubsub()
-    pubsub.subscribe(f"auth_response_{request_id}")
+    async def _listen(self):
+        """
+        ✅ 공유 구독에서 응답을 받아 대기 중인 요청의 future를 완료
+        """
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
 
-    timeout = time.time() + 5  # 5초 동안 응답을 기다림
-    for message in pubsub.listen():
-        print(f"📌 Pub/Sub 메시지 수신: {message}")  # ✅ 추가 로그
+                    request_id = message["channel"][len(AUTH_RESPONSE_PREFIX):]
+                    future = self._pending.pop(request_id, None)
+                    if future is not None and not future.done():
+                        future.set_result(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"🚨 인증 응답 구독 오류, 재연결 시도: {e}")
+                await asyncio.sleep(1)
+                try:
+                    await self._subscribe()
+                except Exception:
+                    pass
 
-        if time.time() > timeout:
-            raise HTTPException(status_code=500, detail="Redis Pub/Sub 응답 시간 초과")
+    async def get_user_info(self, authorization: str):
+        if not authorization.startswith("Bearer "):
+            print(f"🚨 잘못된 Authorization 형식: {authorization}")
+            raise HTTPException(status_code=401, detail="잘못된 토큰 형식: Bearer 필요")
+
+        token = authorization.split("Bearer ")[1]
+        if not AUTH_LOCAL_VERIFY:
+            return await self.request_user(token)
+
+        # ✅ 위조 / 만료 토큰은 Django까지 가지 않고 바로 거절
+        try:
+            claims = decode_access_token(token)
+        except InvalidToken as e:
+            print(f"🚨 토큰 검증 실패: {e}")
+            raise HTTPException(status_code=401, detail="인증 실패")
+
+        user = self.token_cache.get(claims)
+        if user is not None:
+            return user
+
+        user = await self.request_user(token)
+        if user["id"] != claims["user_id"]:
+            raise HTTPException(status_code=401, detail="인증 실패")
+        self.token_cache.set(claims, user)
+        return user
 
-        # ✅ "subscribe" 타입이 아닌 실제 메시지만 처리
-        if message["type"] != "message":
-            continue
+    async def request_user(self, token: str):
+        """
+        ✅ Django AuthConsumer에 사용자 정보 요청 (Redis Stream 요청 → Pub/Sub 응답)
+        """
+        request_id = str(uuid.uuid4())
 
-        response = json.loads(message["data"])
-        print(f"📌 Redis Pub/Sub 최종 인증 응답 수신: {response}")
+        # ✅ 응답이 먼저 도착해도 놓치지 않도록 요청 전에 future 등록
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        try:
+            # ✅ Redis Stream에 요청 추가
+            await self.redis.xadd(AUTH_REQUEST_STREAM, {"request_id": request_id, "access_token": token})
+            response = await asyncio.wait_for(future, AUTH_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"🚨 Redis Pub/Sub 응답 시간 초과! (request_id={request_id})")
+            raise HTTPException(status_code=500, detail="Redis Pub/Sub 응답 시간 초과")
+        finally:
+            self._pending.pop(request_id, None)
 
         if "error" in response:
             raise HTTPException(status_code=401, detail=response["error"])
 
         return response["user"]  # ✅ user 정보만 반환
 
-    raise HTTPException(status_code=500, detail="Redis 인증 시스템 오류")
+
+auth_client = AuthClient()
+
+
+async def get_user_info(authorization: str):
+    return await auth_client.get_user_info(authorization)
@@ -1,75 +1,40 @@
-import redis
-import json
-import threading
+from typing import List
+from util.stream_consumer import StreamConsumer
 
-r = redis.Redis(host="localhost", port=6378, decode_responses=True)
+CACHE_EXPIRE_TIME = 300  # ✅ 5분 TTL
 
-class LikeConsumer:
+class LikeConsumer(StreamConsumer):
     """
     ✅ `post_like_stream`, `comment_like_stream`을 소비하는 (like_service) Consumer
     - `post_like_stream` → 게시글 좋아요 이벤트 처리
     - `comment_like_stream` → 댓글 좋아요 이벤트 처리
     """
     def __init__(self):
-        self.group = "like_consumer_group"
-        self.consumer = "like_service"
-        self.streams = {
-            "post_like_stream": self.handle_post_like,
-            "comment_like_stream": self.handle_comment_like
-        }
+        super().__init__("like_consumer_group", "like_service", {
+            "post_like_stream": self.handle_post_likes,
+            "comment_like_stream": self.handle_comment_likes
+        })
 
-        for stream in self.streams.keys():
-            try:
-                r.xgroup_create(stream, self.group, id="0", mkstream=True)
-                print(f"📌 Redis Stream 그룹 생성 완료: {stream}")
-            except redis.exceptions.ResponseError:
-                print(f"📌 Redis Stream 그룹 이미 존재함: {stream}")
-
-    def start(self):
-        """
-        ✅  좋아요 이벤트를 처리하는 Stream 실행
-        """
-        for stream_name in self.streams.keys():
-            thread = threading.Thread(target=self.process_stream, args=(stream_name,))
-            thread.daemon = True
-            thread.start()
-
-    def process_stream(self, stream_name):
+    def cache_like_counts(self, events: List[dict], id_field: str, item_type: str, pipe):
         """
-        ✅ 게시글 및 댓글 좋아요 이벤트 처리
+        ✅ 토글 직후 계산된 개수로 캐시 갱신 (추가 / 취소 모두 정확, 재처리돼도 같은 값)
+        - 배치 안에서 같은 항목은 stream 순서상 마지막 이벤트의 개수만 SETEX
         """
-        handler = self.streams[stream_name]
-        print(f"📌 Redis Stream 대기 중: {stream_name}")
+        like_counts = {msg_data[id_field]: msg_data["like_count"] for msg_data in events}
+        for item_id, like_count in like_counts.items():
+            pipe.setex(f"like_count:{item_type}:{item_id}", CACHE_EXPIRE_TIME, like_count)
+        return len(like_counts)
 
-        while True:
-            try:
-                messages = r.xreadgroup(self.group, self.consumer, {stream_name: ">"}, count=1, block=1000)
-                for stream, msgs in messages:
-                    for msg_id, msg_data in msgs:
-                        handler(msg_data)
-                        r.xack(stream_name, self.group, msg_id)
-
-            except Exception as e:
-                print(f"🚨 Redis Consumer Error ({stream_name}): {e}")
-
-    def handle_post_like(self, msg_data):
+    async def handle_post_likes(self, events: List[dict], pipe):
         """
         ✅ 게시글 좋아요 이벤트 처리
         """
-        post_id = msg_data["post_id"]
-        like_cache_key = f"like_count:post:{post_id}"
-        new_like_count = int(r.get(like_cache_key) or 0) + 1
-        r.set(like_cache_key, new_like_count)
+        updated = self.cache_like_counts(events, "post_id", "post", pipe)
+        print(f"📌 게시글 좋아요 이벤트 {len(events)}건 처리 (좋아요 캐시 {updated}개 갱신)")
 
-        print(f"📌 게시글 {post_id}의 좋아요 캐시 업데이트 완료")
-
-    def handle_comment_like(self, msg_data):
+    async def handle_comment_likes(self, events: List[dict], pipe):
         """
         ✅ 댓글 좋아요 이벤트 처리
         """
-        comment_id = msg_data["comment_id"]
-        like_cache_key = f"like_count:comment:{comment_id}"
-        new_like_count = int(r.get(like_cache_key) or 0) + 1
-        r.set(like_cache_key, new_like_count)
-
-        print(f"📌 댓글 {comment_id}의 좋아요 캐시 업데이트 완료")
+        updated = self.cache_like_counts(events, "comment_id", "comment", pipe)
+        print(f"📌 댓글 좋아요 이벤트 {len(events)}건 처리 (좋아요 캐시 {updated}개 갱신)")
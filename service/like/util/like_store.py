@@ -0,0 +1,413 @@
+import os
+import uuid
+import asyncio
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import redis
+from sqlalchemy import select, delete, exists, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from model.database import SessionLocal
+from model.models import PostLike, CommentLike, PostLikeCount, CommentLikeCount
+from util.redis_client import r
+
+# ✅ 좋아요 저장소: redis (write-behind, 기본) / db (PostgreSQL에서 토글 한 문장으로 바로 반영)
+LIKE_STORE = os.getenv("LIKE_STORE", "redis")
+LIKE_FLUSH_INTERVAL = float(os.getenv("LIKE_FLUSH_INTERVAL", "1"))  # ✅ DB 반영 주기 (초)
+LIKE_FLUSH_CHUNK = 1000  # ✅ INSERT / DELETE 한 문장에 넣는 행 수
+LIKE_FLUSH_LOCK_TTL = 30  # ✅ 여러 프로세스가 같은 배치를 동시에 반영하지 않도록 잠금 (초)
+LIKE_CACHE_IDLE_TTL = int(os.getenv("LIKE_CACHE_IDLE_TTL", "3600"))  # ✅ 이 시간 동안 토글이 없으면 Redis에서 제거 (초)
+
+# ✅ 좋아요 토글 (원자적): 로드되지 않은 항목이면 {-1, 0}, 토글할 때마다 TTL 갱신
+# KEYS: 좋아요 누른 회원 set, 좋아요 개수, 반영 대기 hash / ARGV: user_id, 대기 hash field ("{item_id}:{user_id}"), TTL
+TOGGLE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return {-1, 0}
+end
+local liked, count
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 1 then
+    redis.call('SREM', KEYS[1], ARGV[1])
+    liked, count = 0, redis.call('DECR', KEYS[2])
+else
+    redis.call('SADD', KEYS[1], ARGV[1])
+    liked, count = 1, redis.call('INCR', KEYS[2])
+end
+redis.call('HSET', KEYS[3], ARGV[2], liked)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return {liked, count}
+"""
+
+# ✅ DB에서 읽은 회원 목록으로 set / 개수 초기화 (이미 로드돼 있으면 아무것도 하지 않음)
+# KEYS: 회원 set, 좋아요 개수 / ARGV: TTL, user_id 목록
+LOAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 2, #ARGV, 1000 do
+    redis.call('SADD', KEYS[1], unpack(ARGV, i, math.min(i + 999, #ARGV)))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('SET', KEYS[2], #ARGV - 1, 'EX', ARGV[1])
+return 1
+"""
+
+
+# ✅ DB 좋아요 토글 (PostgreSQL, 한 문장 = 왕복 한 번 / 트랜잭션 한 번)
+# - del: 좋아요가 있으면 삭제, ins: 삭제한 행이 없을 때만 추가 (동시 추가와 겹치면 ON CONFLICT DO NOTHING)
+# - cnt: 같은 문장에서 개수 테이블에 +1 / -1 반영 후 새 개수 반환 (항목별 행 잠금으로 동시 토글 직렬화)
+# - 삭제한 행이 없으면 좋아요 상태 (동시 요청이 먼저 추가한 경우 ins도 비어 있지만 행은 있음)
+# - delta: 이 문장이 실제로 바꾼 개수 (같은 회원의 동시 토글이 겹쳐 아무것도 바꾸지 않았으면 0)
+DB_TOGGLE_SQL = """
+WITH del AS (
+    DELETE FROM {likes} WHERE {item} = :item_id AND user_id = :user_id
+    RETURNING 1
+), ins AS (
+    INSERT INTO {likes} ({item}, user_id)
+    SELECT CAST(:item_id AS integer), CAST(:user_id AS integer) WHERE NOT EXISTS (SELECT 1 FROM del)
+    ON CONFLICT ({item}, user_id) DO NOTHING
+    RETURNING 1
+), cnt AS (
+    INSERT INTO {counts} ({item}, like_count)
+    VALUES (:item_id, (SELECT COUNT(*) FROM ins) - (SELECT COUNT(*) FROM del))
+    ON CONFLICT ({item}) DO UPDATE SET like_count = {counts}.like_count + EXCLUDED.like_count
+    RETURNING like_count
+)
+SELECT NOT EXISTS (SELECT 1 FROM del) AS liked, (SELECT like_count FROM cnt) AS like_count,
+       (SELECT COUNT(*) FROM ins) - (SELECT COUNT(*) FROM del) AS delta
+"""
+
+
+def chunks(items: List, size: int = LIKE_FLUSH_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def dialect_insert(db):
+    return postgresql.insert if db.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+async def add_counts(db, count_model, column, deltas: Dict[int, int]):
+    """
+    ✅ 개수 테이블에 항목별 증감 반영 (INSERT ... ON CONFLICT DO UPDATE, 없는 항목은 증감값으로 생성)
+    """
+    deltas = [(item_id, delta) for item_id, delta in deltas.items() if delta]
+    insert = dialect_insert(db)
+    for chunk in chunks(deltas):
+        stmt = insert(count_model).values([{column.key: item_id, "like_count": delta} for item_id, delta in chunk])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[column.key],
+            set_={"like_count": count_model.like_count + stmt.excluded.like_count},
+        ))
+
+
+class LikeStore:
+    """
+    ✅ 좋아요 write-behind 저장소 (Redis가 좋아요 여부 / 개수의 기준)
+    - likes:{type}:{id}:users (set), likes:{type}:{id}:count (개수, 로드 여부 표시)
+    - 토글은 Lua 스크립트 한 번 (SISMEMBER → SADD/SREM + INCR/DECR + 반영 대기 기록)
+    - 처음 토글하는 항목만 DB에서 로드, 이후 조회 / 토글은 DB를 거치지 않음
+    - 조회(counts / statuses)는 로드하지 않음: 로드되지 않은 항목은 DB(개수 테이블)에서 읽기만 함
+    - DB 반영은 LikeFlusher가 likes:{type}:pending을 모아 bulk INSERT / DELETE
+    - 로드된 항목은 LIKE_CACHE_IDLE_TTL 동안 토글이 없으면 만료 (토글마다 TTL 갱신)
+      📌 반영 대기 중인 항목은 flush가 TTL을 다시 갱신하므로 DB 반영 전에 만료되지 않음
+    """
+    def __init__(self, item_type: str, model, column, count_model):
+        self.item_type = item_type
+        self.model = model
+        self.column = column  # ✅ PostLike.post_id / CommentLike.comment_id
+        self.count_model = count_model  # ✅ PostLikeCount / CommentLikeCount
+        self.count_column = getattr(count_model, column.key)
+        self.pending_key = f"likes:{item_type}:pending"
+        self.flushing_key = f"likes:{item_type}:flushing"
+        self.lock_key = f"likes:{item_type}:flush_lock"
+        self._toggle = r.register_script(TOGGLE_SCRIPT)
+        self._load = r.register_script(LOAD_SCRIPT)
+        self.db = DbLikeStore(item_type, model, column, count_model)  # ✅ 로드되지 않은 항목 조회용
+
+    def users_key(self, item_id: int) -> str:
+        return f"likes:{self.item_type}:{item_id}:users"
+
+    def count_key(self, item_id: int) -> str:
+        return f"likes:{self.item_type}:{item_id}:count"
+
+    async def load(self, item_ids: Iterable[int]):
+        """
+        ✅ 로드되지 않은 항목들의 좋아요 회원 목록을 쿼리 한 번으로 읽어 Redis에 적재
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        users: Dict[int, List[int]] = {item_id: [] for item_id in item_ids}
+        async with SessionLocal() as db:
+            rows = await db.execute(select(self.column, self.model.user_id).where(self.column.in_(item_ids)))
+            for item_id, user_id in rows:
+                users[item_id].append(user_id)
+
+        pipe = r.pipeline(transaction=False)
+        for item_id, user_ids in users.items():
+            await self._load(
+                keys=[self.users_key(item_id), self.count_key(item_id)],
+                args=[LIKE_CACHE_IDLE_TTL, *user_ids], client=pipe,
+            )
+        await pipe.execute()
+
+    async def toggle(self, item_id: int, user_id: int) -> Tuple[bool, int, int]:
+        """
+        ✅ 좋아요 토글 → (좋아요 상태, 토글 후 개수, 개수 변화)
+        - Lua 스크립트가 원자적이므로 개수 변화는 항상 +1 / -1
+        """
+        keys = [self.users_key(item_id), self.count_key(item_id), self.pending_key]
+        args = [user_id, f"{item_id}:{user_id}", LIKE_CACHE_IDLE_TTL]
+
+        liked, count = await self._toggle(keys=keys, args=args)
+        if liked == -1:
+            await self.load([item_id])
+            liked, count = await self._toggle(keys=keys, args=args)
+        return liked == 1, count, 1 if liked == 1 else -1
+
+    async def counts(self, item_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        ✅ 여러 항목의 좋아요 개수 (MGET 한 번, 로드되지 않은 항목만 개수 테이블에서 조회)
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return {}
+
+        values = await r.mget([self.count_key(item_id) for item_id in item_ids])
+        counts = {item_id: int(value) for item_id, value in zip(item_ids, values) if value is not None}
+
+        missing = [item_id for item_id in item_ids if item_id not in counts]
+        if missing:
+            counts.update(await self.db.counts(missing))
+        return {item_id: counts[item_id] for item_id in item_ids}
+
+    async def status(self, item_id: int, user_id: int) -> Tuple[bool, int]:
+        """
+        ✅ 회원의 좋아요 여부와 개수
+        """
+        return (await self.statuses([item_id], user_id))[item_id]
+
+    async def statuses(self, item_ids: Iterable[int], user_id: int) -> Dict[int, Tuple[bool, int]]:
+        """
+        ✅ 여러 항목의 (회원의 좋아요 여부, 개수) (pipeline 한 번, 로드되지 않은 항목만 DB에서 쿼리 한 번)
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return {}
+
+        pipe = r.pipeline(transaction=False)
+        for item_id in item_ids:
+            pipe.sismember(self.users_key(item_id), user_id)
+        pipe.mget([self.count_key(item_id) for item_id in item_ids])
+        *liked, counts = await pipe.execute()
+
+        statuses = {
+            item_id: (bool(is_liked), int(count))
+            for item_id, is_liked, count in zip(item_ids, liked, counts) if count is not None
+        }
+        missing = [item_id for item_id in item_ids if item_id not in statuses]
+        if missing:
+            statuses.update(await self.db.statuses(missing, user_id))
+        return {item_id: statuses[item_id] for item_id in item_ids}
+
+    async def touch(self, item_ids: Iterable[int]):
+        """
+        ✅ 로드된 항목들의 TTL을 LIKE_CACHE_IDLE_TTL로 갱신 (로드되지 않은 항목은 그대로)
+        """
+        pipe = r.pipeline(transaction=False)
+        for item_id in item_ids:
+            pipe.expire(self.users_key(item_id), LIKE_CACHE_IDLE_TTL)
+            pipe.expire(self.count_key(item_id), LIKE_CACHE_IDLE_TTL)
+        await pipe.execute()
+
+    # ✅ DB 반영 (write-behind)
+    async def flush(self) -> int:
+        """
+        ✅ 반영 대기 중인 토글을 DB에 반영 → 반영한 (항목, 회원) 수
+        - pending hash를 flushing으로 RENAME해서 스냅샷 (반영 중 새 토글은 새 pending에 쌓임)
+        - 같은 (항목, 회원)은 마지막 상태만 남으므로 INSERT ... ON CONFLICT DO NOTHING / DELETE로 멱등 반영
+        - 실제로 추가 / 삭제된 행(RETURNING)만 같은 트랜잭션에서 개수 테이블에 반영
+        - 반영 중 실패하면 flushing이 남아 다음 주기에 다시 반영
+        - 반영 전에 대기 중인 항목들의 TTL을 갱신 (반영이 계속 실패해도 반영 전에 만료되어 DB 값으로 다시 로드되지 않음)
+        """
+        token = uuid.uuid4().hex
+        if not await r.set(self.lock_key, token, nx=True, ex=LIKE_FLUSH_LOCK_TTL):
+            return 0
+        try:
+            retrying = await r.exists(self.flushing_key)
+            if not retrying:
+                try:
+                    await r.rename(self.pending_key, self.flushing_key)
+                except redis.exceptions.ResponseError:
+                    return 0  # ✅ 반영할 토글 없음
+
+            liked, unliked = [], []
+            for field, state in (await r.hgetall(self.flushing_key)).items():
+                item_id, user_id = map(int, field.split(":"))
+                (liked if state == "1" else unliked).append((item_id, user_id))
+
+            # ✅ 재시도 중이면 flushing 뒤에 쌓이고 있는 pending 항목도 함께 갱신
+            item_ids = {item_id for item_id, _ in liked + unliked}
+            if retrying:
+                item_ids.update(int(field.split(":")[0]) for field in await r.hkeys(self.pending_key))
+            await self.touch(item_ids)
+
+            deltas = Counter()
+            async with SessionLocal() as db:
+                insert = dialect_insert(db)
+                for chunk in chunks(liked):
+                    inserted = await db.scalars(
+                        insert(self.model)
+                        .values([{self.column.key: item_id, "user_id": user_id} for item_id, user_id in chunk])
+                        .on_conflict_do_nothing(index_elements=[self.column.key, "user_id"])
+                        .returning(self.column)
+                    )
+                    deltas.update(inserted.all())
+                for chunk in chunks(unliked):
+                    deleted = await db.scalars(
+                        delete(self.model)
+                        .where(tuple_(self.column, self.model.user_id).in_(chunk))
+                        .returning(self.column)
+                    )
+                    deltas.subtract(deleted.all())
+                await add_counts(db, self.count_model, self.count_column, deltas)
+                await db.commit()
+
+            await r.delete(self.flushing_key)
+            return len(liked) + len(unliked)
+        finally:
+            if await r.get(self.lock_key) == token:
+                await r.delete(self.lock_key)
+
+
+class DbLikeStore:
+    """
+    ✅ 좋아요 DB 저장소 (LIKE_STORE=db, LikeStore와 같은 인터페이스)
+    - 토글은 DB_TOGGLE_SQL 한 문장 (읽고 쓰는 사이의 경합 / unique 제약 위반 없음, COUNT(*) 대신 개수 테이블)
+    - PostgreSQL 외(SQLite 등)에서는 같은 순서의 문장들을 트랜잭션 하나로 실행
+    - 토글 즉시 DB에 반영되므로 flush할 것이 없음
+    """
+    def __init__(self, item_type: str, model, column, count_model):
+        self.item_type = item_type
+        self.model = model
+        self.column = column
+        self.count_model = count_model
+        self.count_column = getattr(count_model, column.key)
+        self.toggle_sql = text(DB_TOGGLE_SQL.format(
+            likes=model.__tablename__, counts=count_model.__tablename__, item=column.key,
+        ))
+
+    async def toggle(self, item_id: int, user_id: int) -> Tuple[bool, int, int]:
+        """
+        ✅ 좋아요 토글 → (좋아요 상태, 토글 후 개수, 개수 변화)
+        - 같은 회원의 동시 토글(더블클릭)이 겹치면 한쪽은 아무것도 바꾸지 않으므로 개수 변화 0
+        """
+        async with SessionLocal() as db:
+            if db.bind.dialect.name == "postgresql":
+                liked, count, delta = (await db.execute(self.toggle_sql, {"item_id": item_id, "user_id": user_id})).one()
+            else:
+                liked, count, delta = await self._toggle_statements(db, item_id, user_id)
+            await db.commit()
+        return liked, count, delta
+
+    async def _toggle_statements(self, db, item_id: int, user_id: int) -> Tuple[bool, int, int]:
+        deleted = (await db.execute(
+            delete(self.model)
+            .where(self.column == item_id, self.model.user_id == user_id)
+            .returning(self.column)
+        )).first()
+        inserted = None
+        if deleted is None:
+            inserted = (await db.execute(
+                dialect_insert(db)(self.model)
+                .values({self.column.key: item_id, "user_id": user_id})
+                .on_conflict_do_nothing(index_elements=[self.column.key, "user_id"])
+                .returning(self.column)
+            )).first()
+
+        delta = (inserted is not None) - (deleted is not None)
+        await add_counts(db, self.count_model, self.count_column, {item_id: delta})
+        count = await db.scalar(select(self.count_model.like_count).where(self.count_column == item_id))
+        return deleted is None, count or 0, delta
+
+    async def counts(self, item_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        ✅ 여러 항목의 좋아요 개수 (개수 테이블 조회 한 번, 행이 없으면 0)
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return {}
+        async with SessionLocal() as db:
+            rows = await db.execute(
+                select(self.count_column, self.count_model.like_count).where(self.count_column.in_(item_ids))
+            )
+            counts = dict(rows.all())
+        return {item_id: counts.get(item_id, 0) for item_id in item_ids}
+
+    async def status(self, item_id: int, user_id: int) -> Tuple[bool, int]:
+        """
+        ✅ 회원의 좋아요 여부와 개수
+        """
+        return (await self.statuses([item_id], user_id))[item_id]
+
+    async def statuses(self, item_ids: Iterable[int], user_id: int) -> Dict[int, Tuple[bool, int]]:
+        """
+        ✅ 여러 항목의 (회원의 좋아요 여부, 개수) (쿼리 한 번: 개수 테이블 + 좋아요 여부 EXISTS)
+        - 좋아요가 있는 항목은 개수 테이블에 행이 있으므로 행이 없는 항목은 (False, 0)
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        if not item_ids:
+            return {}
+
+        liked = exists().where(self.column == self.count_column, self.model.user_id == user_id)
+        async with SessionLocal() as db:
+            rows = await db.execute(
+                select(self.count_column, liked, self.count_model.like_count).where(self.count_column.in_(item_ids))
+            )
+            statuses = {item_id: (bool(is_liked), count) for item_id, is_liked, count in rows}
+        return {item_id: statuses.get(item_id, (False, 0)) for item_id in item_ids}
+
+    async def flush(self) -> int:
+        return 0
+
+
+class LikeFlusher:
+    """
+    ✅ LIKE_FLUSH_INTERVAL마다 모든 LikeStore의 반영 대기 토글을 DB에 반영 (lifespan에서 start / stop)
+    """
+    def __init__(self, stores: List[LikeStore], interval: float = LIKE_FLUSH_INTERVAL):
+        self.stores = stores
+        self.interval = interval
+        self._task = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush_all()  # ✅ 종료 전에 남은 토글 반영
+
+    async def flush_all(self):
+        for store in self.stores:
+            try:
+                flushed = await store.flush()
+                if flushed:
+                    print(f"📌 {store.item_type} 좋아요 {flushed}건 DB 반영 완료")
+            except Exception as e:
+                print(f"🚨 {store.item_type} 좋아요 DB 반영 실패 (다음 주기에 재시도): {e}")
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush_all()
+
+
+store_class = DbLikeStore if LIKE_STORE == "db" else LikeStore
+post_likes = store_class("post", PostLike, PostLike.post_id, PostLikeCount)
+comment_likes = store_class("comment", CommentLike, CommentLike.comment_id, CommentLikeCount)
+like_flusher = LikeFlusher([post_likes, comment_likes])
@@ -0,0 +1,18 @@
+import os
+import redis.asyncio as aioredis
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "128"))
+REDIS_POOL_TIMEOUT = 5  # ✅ 풀이 가득 찼을 때 연결 반환을 기다리는 시간 (초)
+
+# ✅ 서비스 전체가 공유하는 redis.asyncio 커넥션 풀 (main.py lifespan에서 close_redis로 정리)
+# - 라우터 / 인증 / Stream Consumer 모두 같은 풀을 사용, 이벤트 루프를 막지 않음
+# - 연결 수가 max_connections에 도달하면 에러 대신 반환될 때까지 대기
+redis_pool = aioredis.BlockingConnectionPool(
+    host="localhost", port=6378, decode_responses=True,
+    max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT,
+)
+r = aioredis.Redis(connection_pool=redis_pool)
+
+
+async def close_redis():
+    await redis_pool.aclose()
@@ -1,6 +1,7 @@
 from django.apps import AppConfig
 import threading
 import sys
+import os
 
 class AccountConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
@@ -9,6 +10,7 @@ class AccountConfig(AppConfig):
     def ready(self):
         """
         Django 서버 실행 시 Redis Stream Consumer를 실행 (runserver일 때만)
+        (그 외 배포 환경에서는 `python manage.py run_auth_consumer --workers N`으로 별도 실행)
         """
         print("📌 Django `ready()` 함수 실행됨")  # ✅ 이 로그가 찍히는지 확인
         if "runserver" not in sys.argv:
@@ -30,8 +32,6 @@ class AccountConfig(AppConfig):
             print("🚨 Django 데이터베이스 연결이 설정되지 않음")
             return
 
-        from .redis_consumer import AuthConsumer
+        from .redis_consumer import run_auth_workers
         print("🚀 Django Redis Consumer 실행 준비 완료!")  # ✅ 로그 추가
-        auth_consumer = AuthConsumer()
-        auth_consumer.start()
-        print("✅ Django Redis Consumer 실행됨")
+        run_auth_workers(workers=int(os.getenv("AUTH_CONSUMER_WORKERS", "2")))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from account.redis_consumer import run_auth_workers
+
+
+class Command(BaseCommand):
+    help = "auth_request_stream 인증 Consumer 워커 실행 (gunicorn 등 runserver 외 배포용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="consumer group 워커 수")
+        parser.add_argument("--batch-size", type=int, default=100, help="한 번에 읽을 메시지 수")
+        parser.add_argument("--block", type=int, default=5000, help="XREADGROUP 대기 시간 (ms)")
+        parser.add_argument("--claim-idle", type=int, default=10000,
+                            help="이 시간(ms) 이상 ACK되지 않은 pending 메시지를 XAUTOCLAIM으로 회수")
+
+    def handle(self, *args, **options):
+        run_auth_workers(
+            workers=options["workers"],
+            batch_size=options["batch_size"],
+            block_ms=options["block"],
+            claim_idle_ms=options["claim_idle"],
+        )
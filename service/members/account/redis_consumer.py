@@ -1,19 +1,41 @@
+import os
 import redis
 import json
+import socket
 import threading
+import time
+from django.db import close_old_connections
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 
 r = redis.Redis(host="localhost", port=6378, decode_responses=True)
 
+AUTH_REQUEST_STREAM = "auth_request_stream"
+AUTH_GROUP = "auth_group"
+AUTH_CONSUMER_EXPIRE_MS = 60 * 60 * 1000  # ✅ pending 없이 이 시간 이상 읽지 않은 consumer 이름은 그룹에서 삭제 (재시작마다 이름이 바뀜)
+
+
 class AuthConsumer:
-    def __init__(self):
-        self.group = "auth_group"
-        self.consumer = "auth_service"
+    """
+    ✅ auth_request_stream 인증 요청 처리 Consumer (consumer group 워커 1개)
+    - 메시지를 batch_size개씩 읽고, 배치의 사용자 id를 in_bulk 쿼리 한 번으로 조회
+    - publish + xack를 pipeline으로 묶어서 한 번에 전송
+    - 다른 워커가 처리하다 멈춘 (claim_idle_ms 이상 pending) 메시지는 XAUTOCLAIM으로 가져와 처리
+    - 종료된 프로세스의 consumer 이름은 회수 주기마다 그룹에서 삭제
+    """
+    def __init__(self, consumer: str = "auth_service", batch_size: int = 100, block_ms: int = 5000,
+                 claim_idle_ms: int = 10000, claim_interval: float = 10.0):
+        self.group = AUTH_GROUP
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self._last_claim = 0.0
 
         # ✅ 기존 그룹이 존재하면 새로 생성하지 않고 그대로 사용
         try:
-            r.xgroup_create("auth_request_stream", self.group, id="0", mkstream=True)
+            r.xgroup_create(AUTH_REQUEST_STREAM, self.group, id="0", mkstream=True)
             print("📌 Redis Stream 그룹 생성 완료")
         except redis.exceptions.ResponseError as e:
             if "BUSYGROUP" in str(e):
@@ -22,7 +44,7 @@ class AuthConsumer:
                 raise
 
     def start(self):
-        print("🚀 Django Redis Consumer 실행됨!")
+        print(f"🚀 Django Redis Consumer 실행됨! ({self.consumer})")
         self.process_auth_requests()
 
     def process_auth_requests(self):
@@ -30,43 +52,99 @@ class AuthConsumer:
 
         while True:
             try:
-                # ✅ 메시지를 가져오는 동안 타임아웃을 줄여서 처리 속도 개선
-                messages = r.xreadgroup(self.group, self.consumer, {"auth_request_stream": ">"}, count=1, block=5000)
-                if messages:
-                    print(f"📌 Redis Stream 메시지 수신: {messages}")  # ✅ 수신 로그 확인
-
-                for stream_name, msgs in messages:
-                    for msg_id, msg_data in msgs:
-                        request_id = msg_data.get("request_id")
-                        access_token = msg_data.get("access_token")
-
-                        print(f"📌 Django Redis Consumer 인증 요청 수신: {msg_data}")
-
-                        try:
-                            User = get_user_model()
-                            token = AccessToken(access_token)
-                            user = User.objects.get(id=token["user_id"])
-
-                            response_data = {
-                                "request_id": request_id,
-                                "user": {
-                                    "id": user.id,
-                                    "username": user.username
-                                }
-                            }
-                            print(f"✅ Django에서 인증 성공: {response_data}")
-
-                        except Exception as e:
-                            response_data = {"request_id": request_id, "error": "인증 실패"}
-                            print(f"🚨 Django에서 인증 실패: {response_data}, 예외: {e}")
-
-                        # ✅ Redis Pub/Sub을 통해 응답 전송
-                        print(f"📌 Redis Pub/Sub 응답 전송 중: {response_data}")
-                        r.publish(f"auth_response_{request_id}", json.dumps(response_data))
-                        print(f"📌 Redis Pub/Sub 전송 완료!")
-
-                        # ✅ 메시지 처리 완료 (ACK)
-                        r.xack("auth_request_stream", self.group, msg_id)
+                if time.monotonic() - self._last_claim >= self.claim_interval:
+                    self.reclaim_pending()
+
+                messages = r.xreadgroup(
+                    self.group, self.consumer, {AUTH_REQUEST_STREAM: ">"},
+                    count=self.batch_size, block=self.block_ms,
+                )
+                for stream_name, msgs in messages or []:
+                    self.handle_batch(msgs)
 
             except Exception as e:
                 print(f"🚨 Redis Consumer Error: {e}")
+                time.sleep(1)
+
+    def reclaim_pending(self):
+        """
+        ✅ 오래 ACK되지 않은 메시지를 이 워커로 가져와 처리 (죽은 워커의 pending 정리)
+        - pending이 없고 오래 읽지 않은 consumer 이름 삭제 (살아 있는 워커는 block_ms마다 읽음)
+        """
+        self._last_claim = time.monotonic()
+        start_id = "0-0"
+        while True:
+            result = r.xautoclaim(
+                AUTH_REQUEST_STREAM, self.group, self.consumer, self.claim_idle_ms,
+                start_id=start_id, count=self.batch_size,
+            )
+            start_id, msgs = result[0], result[1]
+            if msgs:
+                print(f"📌 pending 메시지 {len(msgs)}건 회수 ({self.consumer})")
+                self.handle_batch(msgs)
+            if start_id == "0-0":
+                break
+
+        for info in r.xinfo_consumers(AUTH_REQUEST_STREAM, self.group):
+            if info["name"] != self.consumer and info["pending"] == 0 and info["idle"] > AUTH_CONSUMER_EXPIRE_MS:
+                r.xgroup_delconsumer(AUTH_REQUEST_STREAM, self.group, info["name"])
+                print(f"📌 종료된 consumer 삭제: {info['name']}")
+
+    def handle_batch(self, msgs):
+        """
+        ✅ 메시지 배치 처리: 토큰 검증 → 사용자 일괄 조회 → 응답 publish + ACK (pipeline)
+        """
+        close_old_connections()  # ✅ 장시간 실행되는 워커 스레드의 끊긴 DB 연결 정리
+
+        tokens = {}
+        for msg_id, msg_data in msgs:
+            if not msg_data:
+                continue  # ✅ XAUTOCLAIM 시점에 이미 삭제된 메시지
+            try:
+                tokens[msg_id] = AccessToken(msg_data.get("access_token"))
+            except Exception as e:
+                print(f"🚨 Django에서 인증 실패: 토큰 검증 오류, 예외: {e}")
+
+        User = get_user_model()
+        users = User.objects.in_bulk({token.get("user_id") for token in tokens.values()} - {None})
+
+        pipe = r.pipeline(transaction=False)
+        for msg_id, msg_data in msgs:
+            request_id = (msg_data or {}).get("request_id")
+            token = tokens.get(msg_id)
+            user = users.get(token.get("user_id")) if token is not None else None
+
+            if user is not None:
+                response_data = {
+                    "request_id": request_id,
+                    "user": {
+                        "id": user.id,
+                        "username": user.username
+                    }
+                }
+            else:
+                response_data = {"request_id": request_id, "error": "인증 실패"}
+
+            # ✅ Redis Pub/Sub을 통해 응답 전송 + 메시지 처리 완료 (ACK)
+            if request_id is not None:
+                pipe.publish(f"auth_response_{request_id}", json.dumps(response_data))
+            pipe.xack(AUTH_REQUEST_STREAM, self.group, msg_id)
+        pipe.execute()
+
+
+def run_auth_workers(workers: int = 4, **options):
+    """
+    ✅ 같은 consumer group에 워커 N개를 띄워 인증 요청을 나눠서 처리 (블로킹)
+    - consumer 이름: auth_service-<호스트>-<pid>-<번호> (프로세스 / 컨테이너 여러 개여도 겹치지 않음)
+    """
+    prefix = f"auth_service-{socket.gethostname()}-{os.getpid()}"
+    threads = []
+    for i in range(workers):
+        consumer = AuthConsumer(consumer=f"{prefix}-{i}", **options)
+        thread = threading.Thread(target=consumer.start, name=consumer.consumer, daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    print(f"✅ 인증 Consumer 워커 {workers}개 실행됨")
+    for thread in threads:
+        thread.join()
@@ -1,6 +1,9 @@
+import os
 import redis
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -10,7 +13,34 @@ from .serializers import UserDetailSerializer
 
 FASTAPI_URL = "http://localhost:8008"  # ✅ FastAPI 서버 주소
 r = redis.Redis(host="localhost", port=6378, decode_responses=True)
-CACHE_EXPIRE_TIME_USER = 300  # ✅ 5분 캐싱
+CACHE_EXPIRE_TIME_USER = 60 * 60  # ✅ 1시간 캐싱 (댓글 작성 / 수정 / 삭제 / 좋아요 시 board_service가 user_comments 키 삭제)
+
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_TIMEOUT = (float(os.getenv("HTTP_CONNECT_TIMEOUT", "1")), float(os.getenv("HTTP_TIMEOUT", "3")))  # ✅ (연결, 읽기)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+
+
+def build_session() -> requests.Session:
+    """
+    ✅ FastAPI 호출용 공유 Session (프로세스당 1개)
+    - keep-alive 커넥션 풀 재사용 (요청마다 TCP 연결을 새로 맺지 않음)
+    - 연결 오류 / 5xx는 GET에 한해 백오프 재시도
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=0.05,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http = build_session()
 
 def get_user_comments(user_id):
     """
@@ -26,11 +56,11 @@ def get_user_comments(user_id):
 
     # ✅ 2️⃣ FastAPI에서 댓글 가져오기
     try:
-        response = requests.get(f"{FASTAPI_URL}/comment/user/{user_id}/")
+        response = http.get(f"{FASTAPI_URL}/comment/user/{user_id}/", timeout=HTTP_TIMEOUT)
         response.raise_for_status()
         comments = response.json()
 
-        # ✅ 3️⃣ Redis에 캐싱 (5분 TTL)
+        # ✅ 3️⃣ Redis에 캐싱 (1시간 TTL)
         r.setex(cache_key, CACHE_EXPIRE_TIME_USER, json.dumps(comments))
         print(f"📌 Redis에 사용자 {user_id}의 댓글 캐싱 완료 (TTL: {CACHE_EXPIRE_TIME_USER}초)")
 